@@ -0,0 +1,29 @@
+from fastapi.responses import JSONResponse, ORJSONResponse
+from pydantic import BaseModel
+
+try:
+    import orjson  # noqa: F401
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+# Encode responses with orjson when it is installed; the rendered JSON is the same
+DefaultJSONResponse = ORJSONResponse if ORJSON_AVAILABLE else JSONResponse
+
+
+def model_response(model: BaseModel) -> JSONResponse:
+    """
+    Serialize an already-validated response model straight to a JSON response.
+
+    Returning a model from a route makes FastAPI dump it to a dict, validate that
+    dict against the response model again, and then serialize it. Routes that
+    build their response model themselves can return this instead to skip that
+    second validation pass.
+
+    Args:
+        model: Pydantic model instance to serialize
+
+    Returns:
+        JSON response with the model's JSON-mode dump as content
+    """
+    return DefaultJSONResponse(content=model.model_dump(mode="json"))
@@ -1,18 +1,165 @@
+import asyncio
 import uuid
-import io
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, List, Optional, Set, BinaryIO
 from fastapi import APIRouter, UploadFile, File, Depends, HTTPException, status, Query
 from sqlalchemy.orm import Session
-from sqlalchemy import func
-import pandas as pd
+from sqlalchemy import select, distinct
 
-from app.core.db import get_db
-from app.core.models import Ingest, Transaction
-from app.core.parsing import normalize_transactions, validate_columns
+from app.core.db import get_db, analyze_database
+from app.core.cache import invalidate_caches
+from app.core.models import Ingest, Transaction, TransactionRaw
+from app.core.rollups import clear_monthly_rollups, refresh_monthly_rollups
+from app.core.parsing import (
+    normalize_transactions,
+    raw_transaction_rows,
+    validate_columns,
+    iter_transactions_csv
+)
 
 router = APIRouter()
 
 
+def _distinct_for_ingest(db: Session, column, ingest_id: str) -> List[str]:
+    """Return the sorted distinct non-NULL values of a Transaction column for one ingest."""
+    results = db.execute(
+        select(distinct(column)).where(
+            Transaction.ingest_id == ingest_id,
+            column.isnot(None)
+        ).order_by(column)
+    ).scalars().all()
+    return list(results)
+
+
+def _run_ingest(
+    db: Session,
+    source: BinaryIO,
+    ingest_id: str,
+    filename: str,
+    replace: bool,
+    progress: Dict[str, int]
+) -> Dict[str, Any]:
+    """
+    Load a CSV upload into the database and return the ingest summary.
+    
+    Synchronous (pandas parsing and database writes both block), so the route runs
+    it in a worker thread to keep the event loop free for other requests. The
+    number of rows read so far is kept in progress["row_count"] so a failure can
+    still report it.
+    
+    Args:
+        db: SQLAlchemy database session
+        source: Binary file-like object with the CSV contents
+        ingest_id: ID of the Ingest record to create
+        filename: Original upload filename
+        replace: If True, clear all existing data before ingesting
+        progress: Mutable counters updated while chunks are processed
+    
+    Returns:
+        Ingestion summary with statistics
+    
+    Raises:
+        ValueError: If the CSV is missing required columns or a row fails to parse
+    """
+    deleted_transactions = 0
+    deleted_ingests = 0
+    
+    # If replace is True, clear all existing data
+    if replace:
+        # Raw CSV rows reference transactions, so delete them first
+        db.query(TransactionRaw).delete(synchronize_session=False)
+        # Delete all Transaction rows (the DELETE reports how many rows it removed,
+        # so no separate COUNT is needed)
+        deleted_transactions = db.query(Transaction).delete(synchronize_session=False)
+        # Delete all Ingest rows
+        deleted_ingests = db.query(Ingest).delete(synchronize_session=False)
+        # Rollups describe the deleted rows, so drop them too
+        clear_monthly_rollups(db)
+        # Commit the deletions
+        db.commit()
+        invalidate_caches()
+    # Create Ingest record with status "success"; row_count is filled in once
+    # every chunk has been processed
+    ingest_record = Ingest(
+        ingest_id=ingest_id,
+        filename=filename,
+        row_count=0,
+        status="success",
+        error=None
+    )
+    db.add(ingest_record)
+    db.flush()  # Flush to get ingest_id available for foreign key
+    
+    # Stream the CSV straight from the spooled upload file, one chunk at a time:
+    # validate -> normalize -> bulk insert -> discard
+    date_min = None
+    date_max = None
+    months_seen: Set[str] = set()
+    
+    source.seek(0)
+    for chunk_index, df in enumerate(iter_transactions_csv(source)):
+        progress["row_count"] += len(df)
+        
+        # Validate columns
+        if chunk_index == 0:
+            validate_columns(df)
+        
+        # Normalize transactions
+        transactions = normalize_transactions(df, ingest_id)
+        if not transactions:
+            continue
+        
+        # Bulk insert transactions via a Core executemany (no ORM mapping overhead)
+        db.execute(Transaction.__table__.insert(), transactions)
+        db.execute(TransactionRaw.__table__.insert(), raw_transaction_rows(df, transactions))
+        
+        # Accumulate statistics incrementally
+        dates = [t["date"] for t in transactions]
+        date_min = min(dates) if date_min is None else min(date_min, *dates)
+        date_max = max(dates) if date_max is None else max(date_max, *dates)
+        months_seen.update(t["year_month"] for t in transactions)
+        
+        # Release the chunk before parsing the next one
+        del df, transactions
+    
+    row_count = progress["row_count"]
+    ingest_record.row_count = row_count
+    
+    # Rebuild the per-month rollups in the same transaction as the insert
+    refresh_monthly_rollups(db, months_seen)
+    
+    # Categories and sources seen in this ingest, read back from the inserted rows
+    categories_seen = _distinct_for_ingest(db, Transaction.category, ingest_id)
+    sources_seen = _distinct_for_ingest(db, Transaction.source, ingest_id)
+    
+    # Refresh planner statistics for the new rows
+    analyze_database(db)
+    
+    # Commit the transaction
+    db.commit()
+    invalidate_caches()
+    
+    # Notes about sign convention
+    notes = "Sign convention: expenses are positive numbers, income/settlements are negative numbers."
+    
+    return {
+        "ingest_id": ingest_id,
+        "row_count": row_count,
+        "date_range": {
+            "min": date_min.isoformat() if date_min else None,
+            "max": date_max.isoformat() if date_max else None
+        },
+        "categories_seen": categories_seen,
+        "sources_seen": sources_seen,
+        "notes": notes,
+        "replace_used": replace,
+        "deleted_rows": {
+            "transactions": deleted_transactions,
+            "ingests": deleted_ingests,
+            "total": deleted_transactions + deleted_ingests
+        } if replace else None
+    }
+
+
 @router.post("/ingest")
 async def ingest_csv(
     file: UploadFile = File(...),
@@ -28,105 +175,20 @@ async def ingest_csv(
     ingest_id = str(uuid.uuid4())
     filename = file.filename or "unknown.csv"
     error_message: Optional[str] = None
-    deleted_transactions = 0
-    deleted_ingests = 0
+    progress = {"row_count": 0}
     
     try:
-        # If replace is True, clear all existing data
-        if replace:
-            # Count rows before deletion
-            deleted_transactions = db.query(func.count(Transaction.id)).scalar() or 0
-            deleted_ingests = db.query(func.count(Ingest.ingest_id)).scalar() or 0
-            
-            # Delete all Transaction rows
-            db.query(Transaction).delete()
-            # Delete all Ingest rows
-            db.query(Ingest).delete()
-            # Commit the deletions
-            db.commit()
-        # Read CSV file content
-        contents = await file.read()
-        # Read CSV into pandas DataFrame
-        df = pd.read_csv(io.BytesIO(contents))
-        
-        # Validate columns
-        validate_columns(df)
-        
-        row_count = len(df)
-        
-        # Normalize transactions
-        transactions = normalize_transactions(df, ingest_id)
-        
-        # Create Ingest record with status "success"
-        ingest_record = Ingest(
-            ingest_id=ingest_id,
-            filename=filename,
-            row_count=row_count,
-            status="success",
-            error=None
+        # Parsing and inserting block, so keep them off the event loop
+        return await asyncio.to_thread(
+            _run_ingest, db, file.file, ingest_id, filename, replace, progress
         )
-        db.add(ingest_record)
-        db.flush()  # Flush to get ingest_id available for foreign key
-        
-        # Bulk insert transactions
-        if transactions:
-            db.bulk_insert_mappings(Transaction, transactions)
-        
-        # Commit the transaction
-        db.commit()
-        
-        # Calculate statistics from the dataframe
-        # Date range
-        date_min = None
-        date_max = None
-        if transactions:
-            dates = [t["date"] for t in transactions]
-            date_min = min(dates).isoformat()
-            date_max = max(dates).isoformat()
-        
-        # Categories and sources from dataframe (using distinct logic)
-        categories_seen = []
-        if "Category" in df.columns:
-            categories_seen = df["Category"].dropna().unique().tolist()
-            categories_seen = [str(c) for c in categories_seen]
-        
-        sources_seen = []
-        if "Source" in df.columns:
-            sources_seen = df["Source"].dropna().unique().tolist()
-            sources_seen = [str(s) for s in sources_seen]
-        
-        # Notes about sign convention
-        notes = "Sign convention: expenses are positive numbers, income/settlements are negative numbers."
-        
-        return {
-            "ingest_id": ingest_id,
-            "row_count": row_count,
-            "date_range": {
-                "min": date_min,
-                "max": date_max
-            },
-            "categories_seen": categories_seen,
-            "sources_seen": sources_seen,
-            "notes": notes,
-            "replace_used": replace,
-            "deleted_rows": {
-                "transactions": deleted_transactions,
-                "ingests": deleted_ingests,
-                "total": deleted_transactions + deleted_ingests
-            } if replace else None
-        }
         
     except ValueError as e:
         # Validation or parsing error
         error_message = str(e)
-        row_count = 0
-        
-        # Try to get row count from dataframe if it was created
-        try:
-            if 'df' in locals():
-                row_count = len(df)
-        except:
-            pass
+        row_count = progress["row_count"]
+        # Discard any chunks inserted before the failure
+        db.rollback()
         
         # Create Ingest record with status "failed"
         ingest_record = Ingest(
@@ -151,14 +213,9 @@ async def ingest_csv(
     except Exception as e:
         # Unexpected error
         error_message = f"Unexpected error: {str(e)}"
-        row_count = 0
-        
-        # Try to get row count from dataframe if it was created
-        try:
-            if 'df' in locals():
-                row_count = len(df)
-        except:
-            pass
+        row_count = progress["row_count"]
+        # Discard any chunks inserted before the failure
+        db.rollback()
         
         # Create Ingest record with status "failed"
         ingest_record = Ingest(
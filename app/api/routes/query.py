@@ -1,12 +1,15 @@
 from typing import Dict, Any, List, Optional
 from decimal import Decimal
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Response
 from sqlalchemy import func, distinct
 from sqlalchemy.orm import Session
 
-from app.core.db import get_db
+from app.core.db import get_read_db
+from app.core.cache import TTLCache
 from app.core.models import Transaction
 from app.core.metrics import (
+    _validate_month,
+    cached_metric,
     get_monthly_totals,
     get_category_total,
     get_merchant_total,
@@ -15,7 +18,7 @@ from app.core.metrics import (
     get_category_breakdown,
     get_source_breakdown
 )
-from app.core.evidence import get_evidence_rows
+from app.core.evidence import iter_evidence_rows
 from app.llm.orchestrator import (
     classify_intent,
     extract_month,
@@ -23,7 +26,8 @@ from app.llm.orchestrator import (
     extract_source,
     extract_merchant
 )
-from app.api.schemas import QueryRequest, QueryResponse, EvidenceRow
+from app.api.schemas import QueryRequest, QueryResponse
+from app.api.responses import DefaultJSONResponse, model_response
 
 router = APIRouter()
 
@@ -34,10 +38,17 @@ KNOWN_CATEGORIES = ["Travel", "Essentials", "Food", "Personal", "Home", "Others"
 DEFAULT_SOURCES = ["Chase", "Credit", "Credit Card", "Cash", "BofA", "Starbucks"]
 
 
+# Known sources per month; cleared by ingest via invalidate_caches()
+_known_sources_cache = TTLCache(maxsize=256)
+
+
 def _get_known_sources(db: Session, month: str) -> List[str]:
     """
     Get distinct sources from DB for a given month, merged with default sources.
     
+    Results are cached per month, so repeat queries skip the DISTINCT scan until
+    the next ingest (or the cache TTL) invalidates them.
+    
     Args:
         db: Database session
         month: Month in "YYYY-MM" format
@@ -45,30 +56,53 @@ def _get_known_sources(db: Session, month: str) -> List[str]:
     Returns:
         Sorted list of unique source strings (db_sources + default_sources).
     """
-    db_sources = []
     try:
-        results = db.query(Transaction.source).filter(
-            Transaction.year_month == month,
-            Transaction.source.isnot(None)
-        ).distinct().all()
-        
-        # Convert to list of strings
-        # SQLAlchemy returns tuples when querying a single column: [('Cash',), ('Credit Card',), ...]
-        for result in results:
-            if isinstance(result, tuple):
-                source = result[0]
-            else:
-                source = result
-            
-            if source and str(source).strip():
-                db_sources.append(str(source).strip())
+        sources = _known_sources_cache.get_or_compute(month, lambda: _load_known_sources(db, month))
     except Exception:
-        # On error, db_sources remains empty
-        pass
+        # On error, fall back to the default sources (not cached)
+        sources = tuple(sorted(set(DEFAULT_SOURCES)))
+    return list(sources)
+
+
+def _load_known_sources(db: Session, month: str) -> tuple[str, ...]:
+    """Query distinct sources for a month and merge them with the default sources."""
+    results = db.query(Transaction.source).filter(
+        Transaction.month_key == _validate_month(month),
+        Transaction.source.isnot(None)
+    ).distinct().all()
     
-    # Merge db_sources with default_sources and return sorted unique list
-    all_sources = list(set(db_sources + DEFAULT_SOURCES))
-    return sorted(all_sources)
+    # Convert to list of strings
+    # SQLAlchemy returns tuples when querying a single column: [('Cash',), ('Credit Card',), ...]
+    db_sources = []
+    for result in results:
+        if isinstance(result, tuple):
+            source = result[0]
+        else:
+            source = result
+        
+        if source and str(source).strip():
+            db_sources.append(str(source).strip())
+    
+    # Merge db_sources with default_sources and return sorted unique tuple
+    return tuple(sorted(set(db_sources + DEFAULT_SOURCES)))
+
+
+def _evidence_json(row: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Encode an evidence row exactly as EvidenceRow would serialize it.
+    
+    The rows come typed from the database (date, Decimal), so building an
+    EvidenceRow per row only to dump it again is skipped.
+    """
+    return {
+        "transaction_id": row["transaction_id"],
+        "date": row["date"].isoformat(),
+        "where": row["where"],
+        "what": row["what"],
+        "amount": str(row["amount"]),
+        "category": row["category"],
+        "source": row["source"]
+    }
 
 
 def _format_amount(amount: Decimal) -> str:
@@ -99,11 +133,11 @@ def format_spend_phrase(intent: str, entity_value: Optional[str] = None) -> str:
         return ""
 
 
-@router.post("/query")
+@router.post("/query", response_model=QueryResponse)
 async def query_finance(
     request: QueryRequest,
-    db: Session = Depends(get_db)
-) -> QueryResponse:
+    db: Session = Depends(get_read_db)
+) -> Response:
     """
     Handle financial queries with intent classification and deterministic computation.
     
@@ -112,7 +146,8 @@ async def query_finance(
         db: Database session
         
     Returns:
-        QueryResponse with final_answer, evidence, and trace
+        QueryResponse with final_answer, evidence, and trace, serialized directly
+        (the model is already validated, so FastAPI doesn't validate it again)
     """
     trace: Dict[str, Any] = {
         "intent": None,
@@ -138,11 +173,11 @@ async def query_finance(
     
     if not month:
         trace["intent"] = "unknown"
-        return QueryResponse(
+        return model_response(QueryResponse(
             clarifying_question="Please specify a month in YYYY-MM format (e.g., 2025-05).",
             evidence=[],
             trace=trace
-        )
+        ))
     
     trace["resolved_month"] = month
     trace["parameters"]["month"] = month
@@ -153,8 +188,9 @@ async def query_finance(
     trace["parameters"]["known_categories"] = known_categories
     trace["parameters"]["known_sources"] = known_sources
     
-    # Step 3: Classify intent (pass known_sources for better classification)
-    intent = classify_intent(request.question, known_sources=known_sources)
+    # Step 3: Classify intent (pass known_sources for better classification); the
+    # orchestrator memoizes it per question and known sources
+    intent = classify_intent(request.question, known_sources)
     trace["intent"] = intent
     
     # Step 4: Handle based on intent
@@ -168,7 +204,7 @@ async def query_finance(
     try:
         if intent == "monthly_summary":
             trace["called_functions"].append("get_monthly_totals")
-            totals = get_monthly_totals(db, month)
+            totals = cached_metric(db, get_monthly_totals, month)
             result_data = totals
             numbers = {
                 "expense_total": str(totals["expense_total"]),
@@ -265,7 +301,7 @@ async def query_finance(
         
         elif intent == "top_merchants":
             trace["called_functions"].append("get_top_merchants")
-            merchants = get_top_merchants(db, month, k=5)
+            merchants = cached_metric(db, get_top_merchants, month, k=5)
             result_data = {"merchants": merchants}
             if merchants:
                 top_list = ", ".join([f"{m['where']} ({_format_amount(m['expense_total'])})" for m in merchants[:3]])
@@ -275,7 +311,7 @@ async def query_finance(
         
         elif intent == "category_breakdown":
             trace["called_functions"].append("get_category_breakdown")
-            breakdown = get_category_breakdown(db, month)
+            breakdown = cached_metric(db, get_category_breakdown, month)
             result_data = {"breakdown": breakdown}
             if breakdown:
                 top_categories = ", ".join([f"{c['category']}: {_format_amount(c['expense_total'])}" for c in breakdown[:3]])
@@ -285,7 +321,7 @@ async def query_finance(
         
         elif intent == "source_breakdown":
             trace["called_functions"].append("get_source_breakdown")
-            breakdown = get_source_breakdown(db, month)
+            breakdown = cached_metric(db, get_source_breakdown, month)
             result_data = {"breakdown": breakdown}
             if breakdown:
                 top_sources = ", ".join([f"{s['source']}: {_format_amount(s['expense_total'])}" for s in breakdown[:3]])
@@ -305,19 +341,21 @@ async def query_finance(
         clarifying_question = f"Invalid input: {str(e)}. Please check your question format."
     
     # Step 5: Build evidence
-    evidence_rows_data = get_evidence_rows(db, month, evidence_filters, request.limit_evidence)
-    evidence = [EvidenceRow(**row) for row in evidence_rows_data]
+    evidence = [
+        _evidence_json(row)
+        for row in iter_evidence_rows(db, month, evidence_filters, request.limit_evidence)
+    ]
     
     # Step 6: Update trace with filters_used and evidence_count
     # filters_used should match evidence_filters exactly, but also include month
     trace["filters_used"] = {"month": month, **evidence_filters}
     trace["evidence_count_returned"] = len(evidence)
     
-    # Step 7: Build response
-    return QueryResponse(
-        final_answer=final_answer,
-        clarifying_question=clarifying_question,
-        numbers=numbers,
-        evidence=evidence,
-        trace=trace
-    )
+    # Step 7: Build response (already JSON-ready and shaped like QueryResponse)
+    return DefaultJSONResponse(content={
+        "final_answer": final_answer,
+        "clarifying_question": clarifying_question,
+        "numbers": numbers,
+        "evidence": evidence,
+        "trace": trace
+    })
@@ -1,28 +1,57 @@
-from typing import Dict, Any
+import asyncio
+from typing import Dict, Any, Callable
 from fastapi import APIRouter, Depends, HTTPException, status, Query
+from sqlalchemy.engine import Engine
 from sqlalchemy.orm import Session
+from sqlalchemy.pool import SingletonThreadPool, StaticPool
 
-from app.core.db import get_db
-from app.core.metrics import (
-    get_monthly_totals,
-    get_category_breakdown,
-    get_top_merchants,
-    get_source_breakdown
-)
+from app.core.db import get_read_db
+from app.core.metrics import cached_metric, get_month_aggregates, get_top_merchants
 
 router = APIRouter()
 
 
+def _supports_concurrent_sessions(bind: Engine) -> bool:
+    """
+    Return True if the engine can hand out independent connections to several threads.
+
+    StaticPool and SingletonThreadPool (used for in-memory SQLite) share one DBAPI
+    connection, which must not be used from several threads at once.
+    """
+    return not isinstance(bind.pool, (StaticPool, SingletonThreadPool))
+
+
+def _run_in_session(bind: Engine, fn: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+    """Run a metrics function in its own short-lived session (sessions are not thread-safe)."""
+    with Session(bind=bind) as session:
+        return fn(session, *args, **kwargs)
+
+
+def _compute_summary(db: Session, month: str, top_k: int) -> tuple:
+    """Run the summary queries one after another on a single session."""
+    return (
+        cached_metric(db, get_month_aggregates, month),
+        cached_metric(db, get_top_merchants, month, k=top_k)
+    )
+
+
 @router.get("/summary/monthly")
 async def get_monthly_summary(
     month: str = Query(..., description="Month in YYYY-MM format"),
     top_k: int = Query(5, ge=1, le=20, description="Number of top merchants to return"),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_read_db)
 ) -> Dict[str, Any]:
     """
     Get monthly financial summary including totals, category breakdown,
     top merchants, and source breakdown.
     
+    Totals and the category/source breakdowns come from one aggregate query;
+    top merchants need the merchant column and are queried separately. The two
+    queries run concurrently in worker threads, each on its own pooled
+    connection. Engines backed by a single shared connection run them
+    sequentially in one worker thread instead. Results are cached per month
+    until the next ingest.
+    
     Args:
         month: Month in "YYYY-MM" format (required)
         top_k: Number of top merchants to return (default: 5, min: 1, max: 20)
@@ -32,24 +61,25 @@ async def get_monthly_summary(
         JSON object with month, totals, by_category, top_merchants, and by_source
     """
     try:
-        # Get monthly totals
-        totals = get_monthly_totals(db, month)
-        
-        # Get category breakdown
-        by_category = get_category_breakdown(db, month)
-        
-        # Get top merchants
-        top_merchants = get_top_merchants(db, month, k=top_k)
-        
-        # Get source breakdown
-        by_source = get_source_breakdown(db, month)
+        bind = db.get_bind()
+        if _supports_concurrent_sessions(bind):
+            aggregates, top_merchants = await asyncio.gather(
+                asyncio.to_thread(_run_in_session, bind, cached_metric, get_month_aggregates, month),
+                asyncio.to_thread(
+                    _run_in_session, bind, cached_metric, get_top_merchants, month, k=top_k
+                )
+            )
+        else:
+            aggregates, top_merchants = await asyncio.to_thread(
+                _compute_summary, db, month, top_k
+            )
         
         return {
             "month": month,
-            "totals": totals,
-            "by_category": by_category,
+            "totals": aggregates["totals"],
+            "by_category": aggregates["by_category"],
             "top_merchants": top_merchants,
-            "by_source": by_source
+            "by_source": aggregates["by_source"]
         }
         
     except ValueError as e:
@@ -1,9 +1,10 @@
-import re
 from datetime import date
 from decimal import Decimal
 from typing import Optional, Dict, List, Any
 from pydantic import BaseModel, Field, field_validator
 
+from app.utils.dates import MONTH_RE, VALID_MONTH_NUMBERS
+
 
 class QueryRequest(BaseModel):
     """Request schema for query endpoint."""
@@ -21,25 +22,17 @@ class QueryRequest(BaseModel):
         if not isinstance(v, str):
             raise ValueError(f"Month must be a string, got {type(v).__name__}")
         
-        if not re.match(r"^\d{4}-\d{2}$", v):
+        match = MONTH_RE.match(v)
+        if match is None:
             raise ValueError(
                 f"Invalid month format '{v}'. Expected format: 'YYYY-MM' (e.g., '2025-05')"
             )
         
         # Validate month is between 01-12
-        try:
-            year, month_num = v.split("-")
-            month_int = int(month_num)
-            if month_int < 1 or month_int > 12:
-                raise ValueError(
-                    f"Invalid month '{v}'. Month must be between 01-12"
-                )
-        except ValueError as e:
-            if "Invalid month" in str(e):
-                raise
+        if match.group("month") not in VALID_MONTH_NUMBERS:
             raise ValueError(
-                f"Invalid month format '{v}'. Expected format: 'YYYY-MM' (e.g., '2025-05')"
-            ) from e
+                f"Invalid month '{v}'. Month must be between 01-12"
+            )
         
         return v
 
@@ -0,0 +1,79 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Hashable, List, Optional
+
+from app.core.config import get_settings
+
+# All caches created in this process, so ingest can invalidate them in one call
+_registry: List["TTLCache"] = []
+_registry_lock = threading.Lock()
+
+
+class TTLCache:
+    """
+    Small thread-safe LRU cache whose entries expire after a fixed TTL.
+
+    Used for read-path results derived from the transactions table. Entries are
+    dropped wholesale by invalidate_caches() whenever ingest changes the data;
+    the TTL is only a safety net for writes made outside the app.
+    """
+
+    def __init__(self, maxsize: int = 256, ttl_seconds: Optional[float] = None):
+        self.maxsize = maxsize
+        self.ttl_seconds = (
+            ttl_seconds if ttl_seconds is not None else get_settings().cache_ttl_seconds
+        )
+        self._entries: "OrderedDict[Hashable, tuple[float, Any]]" = OrderedDict()
+        # Bumped by clear(); a value computed across a clear() is stale and not stored
+        self._generation = 0
+        self._lock = threading.Lock()
+        with _registry_lock:
+            _registry.append(self)
+
+    def get_or_compute(self, key: Hashable, compute: Callable[[], Any]) -> Any:
+        """
+        Return the cached value for key, computing and storing it on a miss.
+
+        Args:
+            key: Hashable cache key
+            compute: Zero-argument callable producing the value on a miss
+
+        Returns:
+            Cached or freshly computed value
+        """
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] > now:
+                self._entries.move_to_end(key)
+                return entry[1]
+            generation = self._generation
+
+        # Compute outside the lock so a slow query doesn't block other keys
+        value = compute()
+
+        with self._lock:
+            # An invalidation while computing means value may predate the new data:
+            # return it to this caller but don't cache it
+            if self._generation != generation:
+                return value
+            self._entries[key] = (now + self.ttl_seconds, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+        return value
+
+    def clear(self) -> None:
+        """Drop all cached entries, including any value still being computed."""
+        with self._lock:
+            self._entries.clear()
+            self._generation += 1
+
+
+def invalidate_caches() -> None:
+    """Clear every TTLCache; called whenever ingest changes the transactions table."""
+    with _registry_lock:
+        caches = list(_registry)
+    for cache in caches:
+        cache.clear()
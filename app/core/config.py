@@ -8,6 +8,10 @@ class Settings(BaseSettings):
     database_url: str = "sqlite:///./finance.db"
     app_name: str = "Personal Finance Analyst"
     log_level: str = "INFO"
+    cache_ttl_seconds: float = 300.0
+    db_pool_size: int = 8
+    db_read_pool_size: int = 16
+    db_max_overflow: int = 2
     
     class Config:
         env_file = ".env"
@@ -1,6 +1,6 @@
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event, text
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy.orm import sessionmaker, Session
 from typing import Generator
 
 from app.core.config import get_settings
@@ -12,16 +12,112 @@ connect_args = {}
 if settings.database_url.startswith("sqlite"):
     connect_args = {"check_same_thread": False}
 
+# In-memory SQLite databases exist per connection, so they can't have a second pool
+is_memory_db = settings.database_url == "sqlite://" or ":memory:" in settings.database_url
+
+# Pool sized for endpoints that fan out queries over several sessions at once
+# (see app.api.routes.summary)
+engine_kwargs = {}
+if not is_memory_db:
+    engine_kwargs["pool_size"] = settings.db_pool_size
+    engine_kwargs["max_overflow"] = settings.db_max_overflow
+
 engine = create_engine(
     settings.database_url,
-    connect_args=connect_args
+    connect_args=connect_args,
+    **engine_kwargs
+)
+
+# SQLite tuning applied to every new connection
+SQLITE_PRAGMAS = (
+    "PRAGMA journal_mode=WAL",  # readers don't block the ingest writer
+    "PRAGMA synchronous=NORMAL",  # fsync at WAL checkpoints instead of every commit
+    "PRAGMA mmap_size=1073741824",  # 1GB memory-mapped reads
+    "PRAGMA cache_size=-262144",  # 256MB page cache per connection (negative = KiB)
+    "PRAGMA temp_store=MEMORY",  # GROUP BY / ORDER BY temp b-trees in memory
+    "PRAGMA busy_timeout=5000",  # wait up to 5s for a lock instead of failing
+    "PRAGMA analysis_limit=1000",  # sample at most ~1000 index rows per ANALYZE
 )
 
+# Applied after SQLITE_PRAGMAS on read pool connections. Their reads are served
+# from the shared mmap, so each keeps a small private page cache instead of the
+# 256MB one
+SQLITE_READ_PRAGMAS = (
+    "PRAGMA query_only=ON",  # refuse writes
+    "PRAGMA cache_size=-16384",  # 16MB page cache per connection
+)
+
+# Memory ceiling with the default settings: the write pool opens at most
+# db_pool_size + db_max_overflow = 10 connections of up to 256MB page cache each
+# (2.5GB) and the read pool at most 16 + 2 = 18 of up to 16MB (288MB), about
+# 2.8GB in all, plus the 1GB mmap, which maps the same file pages for every
+# connection. Page caches only grow as pages are read, so this is a bound, not
+# the usual footprint
+
+
+def apply_sqlite_pragmas(dbapi_connection, connection_record) -> None:
+    """Connect-event listener that applies SQLITE_PRAGMAS to a raw DBAPI connection."""
+    cursor = dbapi_connection.cursor()
+    try:
+        for pragma in SQLITE_PRAGMAS:
+            cursor.execute(pragma)
+    finally:
+        cursor.close()
+
+
+def apply_sqlite_read_only(dbapi_connection, connection_record) -> None:
+    """Connect-event listener that applies SQLITE_READ_PRAGMAS to a raw DBAPI connection."""
+    cursor = dbapi_connection.cursor()
+    try:
+        for pragma in SQLITE_READ_PRAGMAS:
+            cursor.execute(pragma)
+    finally:
+        cursor.close()
+
+
+if settings.database_url.startswith("sqlite"):
+    event.listen(engine, "connect", apply_sqlite_pragmas)
+
+# Separate pool for the read-only endpoints (/query, /summary/monthly), so reads
+# never wait on connections held by a long ingest
+if is_memory_db:
+    read_engine = engine
+else:
+    read_engine = create_engine(
+        settings.database_url,
+        connect_args=connect_args,
+        pool_size=settings.db_read_pool_size,
+        max_overflow=settings.db_max_overflow
+    )
+    if settings.database_url.startswith("sqlite"):
+        event.listen(read_engine, "connect", apply_sqlite_pragmas)
+        event.listen(read_engine, "connect", apply_sqlite_read_only)
+
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+ReadSessionLocal = sessionmaker(
+    autocommit=False, autoflush=False, expire_on_commit=False, bind=read_engine
+)
 
 Base = declarative_base()
 
 
+def analyze_database(db: Session) -> None:
+    """
+    Refresh the query planner statistics after a bulk write.
+    
+    Lets SQLite choose the covering indexes on Transaction for the per-month
+    aggregates. Bounded by analysis_limit, so it stays cheap on large tables.
+    Runs in the caller's transaction; the caller is responsible for committing.
+    No-op for other databases, which collect statistics on their own.
+    
+    Args:
+        db: SQLAlchemy database session
+    """
+    if db.get_bind().dialect.name != "sqlite":
+        return
+    db.execute(text("ANALYZE"))
+
+
 def get_db() -> Generator:
     """FastAPI dependency generator for database sessions."""
     db = SessionLocal()
@@ -29,3 +125,17 @@ def get_db() -> Generator:
         yield db
     finally:
         db.close()
+
+
+def get_read_db() -> Generator:
+    """
+    FastAPI dependency generator for read-only database sessions.
+    
+    Sessions come from the read engine's own connection pool; on SQLite those
+    connections are opened with query_only, so any write fails fast.
+    """
+    db = ReadSessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
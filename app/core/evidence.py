@@ -1,41 +1,17 @@
-from typing import Dict, List, Any, Optional
-from sqlalchemy import and_
+from typing import Dict, List, Any, Iterator, Optional
+from sqlalchemy import Select, and_, func, select
 from sqlalchemy.orm import Session
 
 from app.core.models import Transaction
 from app.core.metrics import _validate_month
 
 
-def get_evidence_rows(
-    db: Session,
-    month: str,
-    filters: Dict[str, Any],
-    limit: int
-) -> List[Dict[str, Any]]:
-    """
-    Get evidence transaction rows based on filters.
-    
-    Args:
-        db: SQLAlchemy database session
-        month: Month in "YYYY-MM" format (required)
-        filters: Dictionary that may include:
-            - kind: "expense" (amount > 0) or "income" (amount < 0), defaults to "expense"
-            - category: Filter by category name (exact match, case-sensitive)
-            - merchant: Filter by where_ field (exact match, case-sensitive)
-            - source: Filter by source name (exact match, case-sensitive)
-        limit: Maximum number of rows to return
-        
-    Returns:
-        List of dictionaries with transaction_id, date, where, what, amount,
-        category, source. Ordered by abs_amount descending, then date descending.
-        Returns empty list if no results, invalid month, or filters don't match.
-    """
-    # Validate month format
-    try:
-        _validate_month(month)
-    except ValueError:
-        return []
-    
+# Rows fetched from the cursor per batch while streaming evidence
+EVIDENCE_BATCH_SIZE = 500
+
+
+def _evidence_statement(key: int, filters: Dict[str, Any], limit: int) -> Select:
+    """Build the evidence SELECT for get_evidence_rows/iter_evidence_rows (key: month key)."""
     # Determine amount filter based on kind
     kind = filters.get("kind", "expense")
     if kind == "expense":
@@ -46,41 +22,105 @@ def get_evidence_rows(
         # Default to expense if invalid kind
         amount_filter = Transaction.amount > 0
     
-    # Start building the query
-    query = db.query(Transaction).filter(
+    # Start building the query; select only the returned columns (no ORM
+    # instances are built)
+    stmt = select(
+        Transaction.id,
+        Transaction.date,
+        Transaction.where_,
+        Transaction.what_,
+        Transaction.amount,
+        Transaction.category,
+        Transaction.source
+    ).where(
         and_(
-            Transaction.year_month == month,
+            Transaction.month_key == key,
             amount_filter
         )
     )
     
     # Apply filters (exact match, case-sensitive)
     if "category" in filters and filters["category"] is not None:
-        query = query.filter(Transaction.category == filters["category"])
+        stmt = stmt.where(Transaction.category == filters["category"])
     
     if "source" in filters and filters["source"] is not None:
-        query = query.filter(Transaction.source == filters["source"])
+        stmt = stmt.where(Transaction.source == filters["source"])
     
     if "merchant" in filters and filters["merchant"] is not None:
         # Exact match, case-sensitive for merchant (where_ field)
-        query = query.filter(Transaction.where_ == filters["merchant"])
+        stmt = stmt.where(Transaction.where_ == filters["merchant"])
     
-    # Order by abs_amount descending, then date descending
-    query = query.order_by(Transaction.abs_amount.desc(), Transaction.date.desc()).limit(limit)
+    # Order by absolute amount descending, then date descending
+    return stmt.order_by(func.abs(Transaction.amount).desc(), Transaction.date.desc()).limit(limit)
+
+
+def iter_evidence_rows(
+    db: Session,
+    month: str,
+    filters: Dict[str, Any],
+    limit: int
+) -> Iterator[Dict[str, Any]]:
+    """
+    Stream evidence transaction rows based on filters.
     
-    # Execute query and build result list
-    transactions = query.all()
+    Same rows and order as get_evidence_rows, but fetched from the cursor in
+    batches of EVIDENCE_BATCH_SIZE and yielded one at a time, so callers that
+    re-encode the rows never hold a second full list. The session must stay open
+    until the iterator is exhausted.
     
-    evidence_rows = []
-    for transaction in transactions:
-        evidence_rows.append({
-            "transaction_id": transaction.id,
-            "date": transaction.date,
-            "where": transaction.where_,
-            "what": transaction.what_,
-            "amount": transaction.amount,
-            "category": transaction.category,
-            "source": transaction.source
-        })
+    Args:
+        db: SQLAlchemy database session
+        month: Month in "YYYY-MM" format (required)
+        filters: Evidence filters, as for get_evidence_rows
+        limit: Maximum number of rows to yield
+        
+    Returns:
+        Iterator of dictionaries with transaction_id, date, where, what, amount,
+        category, source. Yields nothing for an invalid month.
+    """
+    # Validate month format
+    try:
+        key = _validate_month(month)
+    except ValueError:
+        return
     
-    return evidence_rows
+    stmt = _evidence_statement(key, filters, limit).execution_options(
+        yield_per=EVIDENCE_BATCH_SIZE
+    )
+    for transaction_id, txn_date, where, what, amount, category, source in db.execute(stmt):
+        yield {
+            "transaction_id": transaction_id,
+            "date": txn_date,
+            "where": where,
+            "what": what,
+            "amount": amount,
+            "category": category,
+            "source": source
+        }
+
+
+def get_evidence_rows(
+    db: Session,
+    month: str,
+    filters: Dict[str, Any],
+    limit: int
+) -> List[Dict[str, Any]]:
+    """
+    Get evidence transaction rows based on filters.
+    
+    Args:
+        db: SQLAlchemy database session
+        month: Month in "YYYY-MM" format (required)
+        filters: Dictionary that may include:
+            - kind: "expense" (amount > 0) or "income" (amount < 0), defaults to "expense"
+            - category: Filter by category name (exact match, case-sensitive)
+            - merchant: Filter by where_ field (exact match, case-sensitive)
+            - source: Filter by source name (exact match, case-sensitive)
+        limit: Maximum number of rows to return
+        
+    Returns:
+        List of dictionaries with transaction_id, date, where, what, amount,
+        category, source. Ordered by absolute amount descending, then date descending.
+        Returns empty list if no results, invalid month, or filters don't match.
+    """
+    return list(iter_evidence_rows(db, month, filters, limit))
@@ -1,44 +1,66 @@
-import re
 from decimal import Decimal
-from typing import Dict, List, Any
-from sqlalchemy import func, and_
+from typing import Dict, List, Any, Callable
+from sqlalchemy import ColumnElement, func, and_, case
 from sqlalchemy.orm import Session
 
-from app.core.models import Transaction
+from app.core.models import (
+    Transaction,
+    MonthlySummary,
+    MonthlyCategoryTotal,
+    MonthlySourceTotal,
+    MonthlyMerchantTotal,
+)
+from app.core.cache import TTLCache
+from app.core.rollups import has_monthly_rollup
+from app.utils.dates import MONTH_RE, VALID_MONTH_NUMBERS, month_key
+from app.utils.money import CENT
 
 
-def _validate_month(month: str) -> None:
+def _validate_month(month: str) -> int:
     """
-    Validate month format is "YYYY-MM".
+    Validate month format is "YYYY-MM" and return its integer month key.
     
     Args:
         month: Month string to validate
         
+    Returns:
+        Month key (year * 12 + month) for filtering Transaction.month_key
+        
     Raises:
         ValueError: If month format is invalid
     """
     if not isinstance(month, str):
         raise ValueError(f"Month must be a string, got {type(month).__name__}")
     
-    if not re.match(r"^\d{4}-\d{2}$", month):
+    match = MONTH_RE.match(month)
+    if match is None:
         raise ValueError(
             f"Invalid month format '{month}'. Expected format: 'YYYY-MM' (e.g., '2025-05')"
         )
     
     # Validate month is between 01-12
-    try:
-        year, month_num = month.split("-")
-        month_int = int(month_num)
-        if month_int < 1 or month_int > 12:
-            raise ValueError(
-                f"Invalid month '{month}'. Month must be between 01-12"
-            )
-    except ValueError as e:
-        if "Invalid month" in str(e):
-            raise
+    if match.group("month") not in VALID_MONTH_NUMBERS:
         raise ValueError(
-            f"Invalid month format '{month}'. Expected format: 'YYYY-MM' (e.g., '2025-05')"
-        ) from e
+            f"Invalid month '{month}'. Month must be between 01-12"
+        )
+    
+    return month_key(int(month[:4]), int(match.group("month")))
+
+
+def _month_expenses(key: int) -> ColumnElement[bool]:
+    """
+    Filter for one month's expense rows (amount > 0), shared by the live queries.
+    
+    The clause only changes in its bound month key, so SQLAlchemy's compiled
+    statement cache reuses the compiled SQL across calls.
+    
+    Args:
+        key: Month key returned by _validate_month
+        
+    Returns:
+        SQL boolean clause on Transaction
+    """
+    return and_(Transaction.month_key == key, Transaction.amount > 0)
 
 
 def get_monthly_totals(db: Session, month: str) -> Dict[str, Decimal]:
@@ -53,33 +75,32 @@ def get_monthly_totals(db: Session, month: str) -> Dict[str, Decimal]:
         Dictionary with expense_total, income_total, net_total (all Decimal),
         and transaction_count (int)
     """
-    _validate_month(month)
-    
-    # Base query filtered by month
-    base_query = db.query(Transaction).filter(Transaction.year_month == month)
-    
-    # Expense total (amount > 0)
-    expense_total = db.query(func.sum(Transaction.amount)).filter(
-        and_(Transaction.year_month == month, Transaction.amount > 0)
-    ).scalar() or Decimal("0.00")
-    
-    # Income total (amount < 0)
-    income_total = db.query(func.sum(Transaction.amount)).filter(
-        and_(Transaction.year_month == month, Transaction.amount < 0)
-    ).scalar() or Decimal("0.00")
-    
-    # Net total (sum of all amounts)
-    net_total = db.query(func.sum(Transaction.amount)).filter(
-        Transaction.year_month == month
-    ).scalar() or Decimal("0.00")
-    
-    # Transaction count
-    transaction_count = base_query.count()
+    key = _validate_month(month)
+    
+    # Serve from the rollup table when ingest has populated it for this month
+    summary = db.get(MonthlySummary, month)
+    if summary is not None:
+        return {
+            "expense_total": Decimal(summary.expense_total).quantize(CENT),
+            "income_total": Decimal(summary.income_total).quantize(CENT),
+            "net_total": Decimal(summary.net_total).quantize(CENT),
+            "transaction_count": summary.transaction_count
+        }
+    
+    # Expense, income, and net sums plus the row count in one pass over the month
+    expense_total, income_total, net_total, transaction_count = db.query(
+        func.coalesce(func.sum(case((Transaction.amount > 0, Transaction.amount), else_=0)), 0),
+        func.coalesce(func.sum(case((Transaction.amount < 0, Transaction.amount), else_=0)), 0),
+        func.coalesce(func.sum(Transaction.amount), 0),
+        func.count()
+    ).filter(
+        Transaction.month_key == key
+    ).one()
     
     # Quantize all Decimal values to 2 decimal places
-    expense_total = Decimal(expense_total).quantize(Decimal("0.01"))
-    income_total = Decimal(income_total).quantize(Decimal("0.01"))
-    net_total = Decimal(net_total).quantize(Decimal("0.01"))
+    expense_total = Decimal(expense_total).quantize(CENT)
+    income_total = Decimal(income_total).quantize(CENT)
+    net_total = Decimal(net_total).quantize(CENT)
     
     return {
         "expense_total": expense_total,
@@ -101,27 +122,34 @@ def get_category_breakdown(db: Session, month: str) -> List[Dict[str, Any]]:
         List of dictionaries with 'category' and 'expense_total' (Decimal),
         ordered by expense_total descending
     """
-    _validate_month(month)
-    
-    results = db.query(
-        Transaction.category,
-        func.sum(Transaction.amount).label('expense_total')
-    ).filter(
-        and_(Transaction.year_month == month, Transaction.amount > 0)
-    ).group_by(Transaction.category).order_by(
-        func.sum(Transaction.amount).desc()
-    ).all()
-    
-    breakdown = []
-    for category, total in results:
-        if category is not None:  # Skip NULL categories
-            quantized_total = Decimal(total).quantize(Decimal("0.01"))
-            breakdown.append({
-                "category": category,
-                "expense_total": quantized_total
-            })
-    
-    return breakdown
+    key = _validate_month(month)
+    
+    if has_monthly_rollup(db, month):
+        results = db.query(
+            MonthlyCategoryTotal.category,
+            MonthlyCategoryTotal.expense_total
+        ).filter(
+            MonthlyCategoryTotal.year_month == month,
+            MonthlyCategoryTotal.category.isnot(None)
+        ).order_by(MonthlyCategoryTotal.expense_total.desc(), MonthlyCategoryTotal.category).all()
+    else:
+        expense_total = func.sum(Transaction.amount).label('expense_total')
+        results = db.query(
+            Transaction.category,
+            expense_total
+        ).filter(
+            _month_expenses(key),
+            Transaction.category.isnot(None)
+        ).group_by(Transaction.category).order_by(
+            expense_total.desc(), Transaction.category
+        ).all()
+    
+    # NULL categories are filtered in SQL; Numeric(x, 2) sums already come back as
+    # 2-decimal-place Decimals
+    return [
+        {"category": category, "expense_total": total}
+        for category, total in results
+    ]
 
 
 def get_top_merchants(db: Session, month: str, k: int = 5) -> List[Dict[str, Any]]:
@@ -137,29 +165,35 @@ def get_top_merchants(db: Session, month: str, k: int = 5) -> List[Dict[str, Any
         List of dictionaries with 'where', 'expense_total' (Decimal), and 'count' (int),
         ordered by expense_total descending
     """
-    _validate_month(month)
-    
-    results = db.query(
-        Transaction.where_,
-        func.sum(Transaction.amount).label('expense_total'),
-        func.count(Transaction.id).label('count')
-    ).filter(
-        and_(Transaction.year_month == month, Transaction.amount > 0)
-    ).group_by(Transaction.where_).order_by(
-        func.sum(Transaction.amount).desc()
-    ).limit(k).all()
-    
-    merchants = []
-    for where, total, count in results:
-        if where is not None:  # Skip NULL where_
-            quantized_total = Decimal(total).quantize(Decimal("0.01"))
-            merchants.append({
-                "where": where,
-                "expense_total": quantized_total,
-                "count": count
-            })
-    
-    return merchants
+    key = _validate_month(month)
+    
+    if has_monthly_rollup(db, month):
+        results = db.query(
+            MonthlyMerchantTotal.where_,
+            MonthlyMerchantTotal.expense_total,
+            MonthlyMerchantTotal.count
+        ).filter(
+            MonthlyMerchantTotal.year_month == month,
+            MonthlyMerchantTotal.where_.isnot(None)
+        ).order_by(MonthlyMerchantTotal.expense_total.desc(), MonthlyMerchantTotal.where_).limit(k).all()
+    else:
+        expense_total = func.sum(Transaction.amount).label('expense_total')
+        results = db.query(
+            Transaction.where_,
+            expense_total,
+            func.count().label('count')
+        ).filter(
+            _month_expenses(key),
+            Transaction.where_.isnot(None)
+        ).group_by(Transaction.where_).order_by(
+            expense_total.desc(), Transaction.where_
+        ).limit(k).all()
+    
+    # NULL where_ is filtered in SQL, so LIMIT k counts named merchants only
+    return [
+        {"where": where, "expense_total": total, "count": count}
+        for where, total, count in results
+    ]
 
 
 def get_source_breakdown(db: Session, month: str) -> List[Dict[str, Any]]:
@@ -174,27 +208,108 @@ def get_source_breakdown(db: Session, month: str) -> List[Dict[str, Any]]:
         List of dictionaries with 'source' and 'expense_total' (Decimal),
         ordered by expense_total descending
     """
-    _validate_month(month)
+    key = _validate_month(month)
+    
+    if has_monthly_rollup(db, month):
+        results = db.query(
+            MonthlySourceTotal.source,
+            MonthlySourceTotal.expense_total
+        ).filter(
+            MonthlySourceTotal.year_month == month,
+            MonthlySourceTotal.source.isnot(None)
+        ).order_by(MonthlySourceTotal.expense_total.desc(), MonthlySourceTotal.source).all()
+    else:
+        expense_total = func.sum(Transaction.amount).label('expense_total')
+        results = db.query(
+            Transaction.source,
+            expense_total
+        ).filter(
+            _month_expenses(key),
+            Transaction.source.isnot(None)
+        ).group_by(Transaction.source).order_by(
+            expense_total.desc(), Transaction.source
+        ).all()
+    
+    # NULL sources are filtered in SQL
+    return [
+        {"source": source, "expense_total": total}
+        for source, total in results
+    ]
+
+
+def _sorted_breakdown(totals: Dict[str, Decimal], key: str) -> List[Dict[str, Any]]:
+    """Format per-group expense totals like the breakdown queries (total desc, then name)."""
+    return [
+        {key: name, "expense_total": total.quantize(CENT)}
+        for name, total in sorted(totals.items(), key=lambda item: (-item[1], item[0]))
+    ]
+
+
+def get_month_aggregates(db: Session, month: str) -> Dict[str, Any]:
+    """
+    Get monthly totals plus category and source breakdowns from a single scan.
+    
+    Months without rollup rows are aggregated with one GROUP BY category, source
+    query, and the cross-tab is pivoted in Python, instead of the separate scans
+    made by get_monthly_totals, get_category_breakdown and get_source_breakdown.
+    Rolled-up months are already cheap and are read from the rollup tables.
+    
+    Args:
+        db: SQLAlchemy database session
+        month: Month in "YYYY-MM" format
+        
+    Returns:
+        Dictionary with 'totals', 'by_category' and 'by_source', shaped exactly like
+        the results of get_monthly_totals, get_category_breakdown and
+        get_source_breakdown
+    """
+    key = _validate_month(month)
+    
+    if has_monthly_rollup(db, month):
+        return {
+            "totals": get_monthly_totals(db, month),
+            "by_category": get_category_breakdown(db, month),
+            "by_source": get_source_breakdown(db, month)
+        }
     
     results = db.query(
+        Transaction.category,
         Transaction.source,
-        func.sum(Transaction.amount).label('expense_total')
+        func.sum(case((Transaction.amount > 0, Transaction.amount))).label('expense_total'),
+        func.sum(case((Transaction.amount < 0, Transaction.amount))).label('income_total'),
+        func.count().label('count')
     ).filter(
-        and_(Transaction.year_month == month, Transaction.amount > 0)
-    ).group_by(Transaction.source).order_by(
-        func.sum(Transaction.amount).desc()
-    ).all()
-    
-    breakdown = []
-    for source, total in results:
+        Transaction.month_key == key
+    ).group_by(Transaction.category, Transaction.source).all()
+    
+    expense_total = Decimal("0.00")
+    income_total = Decimal("0.00")
+    transaction_count = 0
+    by_category: Dict[str, Decimal] = {}
+    by_source: Dict[str, Decimal] = {}
+    for category, source, expenses, income, count in results:
+        transaction_count += count
+        if income is not None:
+            income_total += Decimal(income)
+        if expenses is None:  # No expenses in this group
+            continue
+        expenses = Decimal(expenses)
+        expense_total += expenses
+        if category is not None:  # Skip NULL categories
+            by_category[category] = by_category.get(category, Decimal("0.00")) + expenses
         if source is not None:  # Skip NULL sources
-            quantized_total = Decimal(total).quantize(Decimal("0.01"))
-            breakdown.append({
-                "source": source,
-                "expense_total": quantized_total
-            })
+            by_source[source] = by_source.get(source, Decimal("0.00")) + expenses
     
-    return breakdown
+    return {
+        "totals": {
+            "expense_total": expense_total.quantize(CENT),
+            "income_total": income_total.quantize(CENT),
+            "net_total": (expense_total + income_total).quantize(CENT),
+            "transaction_count": transaction_count
+        },
+        "by_category": _sorted_breakdown(by_category, "category"),
+        "by_source": _sorted_breakdown(by_source, "source")
+    }
 
 
 def get_category_total(db: Session, month: str, category: str) -> Dict[str, Any]:
@@ -209,28 +324,29 @@ def get_category_total(db: Session, month: str, category: str) -> Dict[str, Any]
     Returns:
         Dictionary with 'expense_total' (Decimal) and 'count' (int)
     """
-    _validate_month(month)
-    
-    # Expense total for category (amount > 0)
-    expense_total = db.query(func.sum(Transaction.amount)).filter(
-        and_(
-            Transaction.year_month == month,
-            Transaction.amount > 0,
-            Transaction.category == category
-        )
-    ).scalar() or Decimal("0.00")
-    
-    # Transaction count for category
-    count = db.query(Transaction).filter(
-        and_(
-            Transaction.year_month == month,
-            Transaction.amount > 0,
+    key = _validate_month(month)
+    
+    if has_monthly_rollup(db, month):
+        # Read the month's rollup rows instead of scanning its transactions
+        expense_total, count = db.query(
+            func.coalesce(func.sum(MonthlyCategoryTotal.expense_total), 0),
+            func.coalesce(func.sum(MonthlyCategoryTotal.count), 0)
+        ).filter(
+            MonthlyCategoryTotal.year_month == month,
+            MonthlyCategoryTotal.category == category
+        ).one()
+    else:
+        # Expense total and transaction count for category (amount > 0) in one query
+        expense_total, count = db.query(
+            func.coalesce(func.sum(Transaction.amount), 0),
+            func.count()
+        ).filter(
+            _month_expenses(key),
             Transaction.category == category
-        )
-    ).count()
+        ).one()
     
     # Quantize to 2 decimal places
-    expense_total = Decimal(expense_total).quantize(Decimal("0.01"))
+    expense_total = Decimal(expense_total).quantize(CENT)
     
     return {
         "expense_total": expense_total,
@@ -251,31 +367,33 @@ def get_merchant_total(db: Session, month: str, merchant: str) -> Dict[str, Any]
     Returns:
         Dictionary with 'expense_total' (Decimal) and 'count' (int)
     """
-    _validate_month(month)
+    key = _validate_month(month)
     
     # Convert merchant to lowercase for case-insensitive matching
     merchant_lower = merchant.lower()
     
-    # Expense total for merchant (amount > 0, case-insensitive match)
-    expense_total = db.query(func.sum(Transaction.amount)).filter(
-        and_(
-            Transaction.year_month == month,
-            Transaction.amount > 0,
+    if has_monthly_rollup(db, month):
+        # Read the month's rollup rows instead of scanning its transactions
+        expense_total, count = db.query(
+            func.coalesce(func.sum(MonthlyMerchantTotal.expense_total), 0),
+            func.coalesce(func.sum(MonthlyMerchantTotal.count), 0)
+        ).filter(
+            MonthlyMerchantTotal.year_month == month,
+            func.lower(MonthlyMerchantTotal.where_) == merchant_lower
+        ).one()
+    else:
+        # Expense total and transaction count for merchant (amount > 0,
+        # case-insensitive match) in one query
+        expense_total, count = db.query(
+            func.coalesce(func.sum(Transaction.amount), 0),
+            func.count()
+        ).filter(
+            _month_expenses(key),
             func.lower(Transaction.where_) == merchant_lower
-        )
-    ).scalar() or Decimal("0.00")
-    
-    # Transaction count for merchant
-    count = db.query(Transaction).filter(
-        and_(
-            Transaction.year_month == month,
-            Transaction.amount > 0,
-            func.lower(Transaction.where_) == merchant_lower
-        )
-    ).count()
+        ).one()
     
     # Quantize to 2 decimal places
-    expense_total = Decimal(expense_total).quantize(Decimal("0.01"))
+    expense_total = Decimal(expense_total).quantize(CENT)
     
     return {
         "expense_total": expense_total,
@@ -295,30 +413,67 @@ def get_source_total(db: Session, month: str, source: str) -> Dict[str, Any]:
     Returns:
         Dictionary with 'expense_total' (Decimal) and 'count' (int)
     """
-    _validate_month(month)
-    
-    # Expense total for source (amount > 0)
-    expense_total = db.query(func.sum(Transaction.amount)).filter(
-        and_(
-            Transaction.year_month == month,
-            Transaction.amount > 0,
-            Transaction.source == source
-        )
-    ).scalar() or Decimal("0.00")
-    
-    # Transaction count for source
-    count = db.query(Transaction).filter(
-        and_(
-            Transaction.year_month == month,
-            Transaction.amount > 0,
+    key = _validate_month(month)
+    
+    if has_monthly_rollup(db, month):
+        # Read the month's rollup rows instead of scanning its transactions
+        expense_total, count = db.query(
+            func.coalesce(func.sum(MonthlySourceTotal.expense_total), 0),
+            func.coalesce(func.sum(MonthlySourceTotal.count), 0)
+        ).filter(
+            MonthlySourceTotal.year_month == month,
+            MonthlySourceTotal.source == source
+        ).one()
+    else:
+        # Expense total and transaction count for source (amount > 0) in one query
+        expense_total, count = db.query(
+            func.coalesce(func.sum(Transaction.amount), 0),
+            func.count()
+        ).filter(
+            _month_expenses(key),
             Transaction.source == source
-        )
-    ).count()
+        ).one()
     
     # Quantize to 2 decimal places
-    expense_total = Decimal(expense_total).quantize(Decimal("0.01"))
+    expense_total = Decimal(expense_total).quantize(CENT)
     
     return {
         "expense_total": expense_total,
         "count": count
     }
+
+
+# Per-month aggregate results served to the API; cleared by ingest via invalidate_caches()
+_metrics_cache = TTLCache(maxsize=1024)
+
+
+def cached_metric(db: Session, fn: Callable[..., Any], month: str, **kwargs: Any) -> Any:
+    """
+    Call a per-month metrics function through the shared result cache.
+    
+    Results are keyed by (function, month, keyword arguments), so repeat requests
+    for the same month skip the aggregate query until the next ingest clears the
+    cache. A query still running when an ingest invalidates the cache is not
+    stored, so pre-ingest totals are never served afterwards. Callers must treat
+    the returned value as read-only, since it is shared between requests.
+    
+    The cache is process-global and its key does not include the session or
+    database: code that points the app at a different database (for example by
+    swapping get_db/get_read_db dependency overrides) must call
+    invalidate_caches() when it does so.
+    
+    Args:
+        db: SQLAlchemy database session, used only on a cache miss
+        fn: Metrics function taking (db, month, **kwargs), e.g. get_monthly_totals
+        month: Month in "YYYY-MM" format
+        **kwargs: Extra keyword arguments for fn (e.g. k for get_top_merchants)
+        
+    Returns:
+        The cached or freshly computed result of fn(db, month, **kwargs)
+        
+    Raises:
+        ValueError: If month format is invalid (errors are never cached)
+    """
+    _validate_month(month)
+    key = (fn, month, tuple(sorted(kwargs.items())))
+    return _metrics_cache.get_or_compute(key, lambda: fn(db, month, **kwargs))
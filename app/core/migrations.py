@@ -0,0 +1,135 @@
+from sqlalchemy import MetaData, inspect, text
+from sqlalchemy.engine import Connection, Engine
+from sqlalchemy.schema import CreateTable
+
+from app.core.db import Base
+from app.core.models import Ingest, Transaction
+
+# year * 12 + month from the stored "YYYY-MM" string (see app.utils.dates.month_key)
+MONTH_KEY_BACKFILL = text(
+    "UPDATE transactions "
+    "SET month_key = CAST(substr(year_month, 1, 4) AS INTEGER) * 12 "
+    "+ CAST(substr(year_month, 6, 2) AS INTEGER) "
+    "WHERE month_key IS NULL"
+)
+
+# Indexes on transactions that earlier schemas declared and the model has since
+# replaced: the year_month indexes (now keyed on month_key) and the abs_amount
+# evidence indexes (now on abs(amount)). Only these are dropped on startup, so
+# indexes added to the database by hand are left alone
+LEGACY_TRANSACTION_INDEXES = (
+    "ix_transactions_year_month",
+    "idx_category_year_month",
+    "idx_where_year_month",
+    "idx_source_year_month",
+    "idx_year_month_category_amount",
+    "idx_year_month_source_amount",
+    "idx_year_month_where_amount",
+    "idx_year_month_where_lower_amount",
+    "idx_year_month_abs_amount_date",
+    "idx_year_month_abs_amount_date_expense",
+    "idx_year_month_abs_amount_date_income",
+)
+
+
+def _transaction_columns(connection: Connection) -> set:
+    """Return the column names the transactions table has in the database."""
+    return {column["name"] for column in inspect(connection).get_columns("transactions")}
+
+
+def _add_month_key(connection: Connection) -> None:
+    """Add transactions.month_key to a table created before it existed, and fill it in."""
+    connection.execute(text("ALTER TABLE transactions ADD COLUMN month_key INTEGER"))
+    connection.execute(MONTH_KEY_BACKFILL)
+
+
+def _rebuild_transactions(connection: Connection, columns: set) -> None:
+    """
+    Recreate the transactions table with exactly the model's columns, keeping every row.
+
+    Needed for columns the model has dropped: abs_amount is NOT NULL, so inserts
+    that no longer supply it fail until it is gone, and raw_row now lives in
+    transaction_raw. Follows SQLite's documented table rebuild (create the new
+    table under a temporary name, copy, drop the old one, rename), which works
+    on SQLite versions without ALTER TABLE DROP COLUMN. Dropping the old table
+    drops all of its indexes; the model's are recreated afterwards by
+    _sync_transaction_indexes.
+    """
+    # Keep raw CSV rows that were stored on the transactions table
+    if "raw_row" in columns:
+        connection.execute(text(
+            "INSERT OR IGNORE INTO transaction_raw (transaction_id, ingest_id, raw_row) "
+            "SELECT id, ingest_id, raw_row FROM transactions WHERE raw_row IS NOT NULL"
+        ))
+
+    # Copy of the model table under a temporary name; ingest is copied alongside
+    # so the foreign key can be rendered
+    metadata = MetaData()
+    Ingest.__table__.to_metadata(metadata)
+    new_table = Transaction.__table__.to_metadata(metadata, name="transactions_new")
+    connection.execute(CreateTable(new_table))
+
+    column_list = ", ".join(f'"{column.name}"' for column in Transaction.__table__.columns)
+    connection.execute(text(
+        f"INSERT INTO transactions_new ({column_list}) SELECT {column_list} FROM transactions"
+    ))
+    connection.execute(text("DROP TABLE transactions"))
+    connection.execute(text("ALTER TABLE transactions_new RENAME TO transactions"))
+
+
+def _transaction_index_names(connection: Connection) -> set:
+    """Return the names of the explicitly created indexes on the transactions table."""
+    if connection.dialect.name == "sqlite":
+        # The inspector skips expression indexes on SQLite, so read the catalog
+        # directly; automatic (primary key) indexes have no SQL
+        return set(connection.execute(text(
+            "SELECT name FROM sqlite_master "
+            "WHERE type = 'index' AND tbl_name = 'transactions' AND sql IS NOT NULL"
+        )).scalars())
+    return {index["name"] for index in inspect(connection).get_indexes("transactions")}
+
+
+def _sync_transaction_indexes(connection: Connection) -> None:
+    """
+    Make the transactions table's indexes match the model.
+
+    create_all skips indexes on tables that already exist, so indexes added to
+    the model later are created here, and the ones they replaced
+    (LEGACY_TRANSACTION_INDEXES) are dropped. Any other index is kept.
+    """
+    model_indexes = {index.name: index for index in Transaction.__table__.indexes}
+    existing = _transaction_index_names(connection)
+
+    for name in LEGACY_TRANSACTION_INDEXES:
+        if name in existing:
+            connection.execute(text(f'DROP INDEX "{name}"'))
+    for name, index in model_indexes.items():
+        if name not in existing:
+            index.create(connection)
+
+
+def init_database(engine: Engine) -> None:
+    """
+    Create missing tables and upgrade an existing database to the current schema.
+
+    Idempotent: on a database that is already current it only inspects the
+    schema. Older database files are upgraded in place, so they don't need to be
+    recreated:
+    - transactions.month_key is added and backfilled from year_month
+    - columns the model no longer has (abs_amount, raw_row) are removed by
+      rebuilding the table; stored raw rows move to transaction_raw
+    - missing model indexes on transactions are created and the legacy ones
+      they replaced are dropped
+
+    Args:
+        engine: Engine for the application database
+    """
+    Base.metadata.create_all(bind=engine)
+
+    with engine.begin() as connection:
+        columns = _transaction_columns(connection)
+        if "month_key" not in columns:
+            _add_month_key(connection)
+        if columns - {column.name for column in Transaction.__table__.columns}:
+            _rebuild_transactions(connection, columns)
+        _sync_transaction_indexes(connection)
@@ -1,12 +1,13 @@
 from datetime import datetime, date
 from decimal import Decimal
 from sqlalchemy import (
-    Column, String, Integer, Date, DateTime, Numeric, Text, ForeignKey, Index
+    Column, String, Integer, Date, DateTime, Numeric, Text, ForeignKey, Index, func, text
 )
 from sqlalchemy.orm import relationship
 import uuid
 
 from app.core.db import Base
+from app.utils.dates import year_month_key
 
 
 class Ingest(Base):
@@ -20,8 +21,9 @@ class Ingest(Base):
     status = Column(String(50), nullable=False)
     error = Column(Text, nullable=True)
     
-    # Relationship to transactions
-    transactions = relationship("Transaction", back_populates="ingest")
+    # Relationship to transactions; lazy="raise" so an ingest's rows are never
+    # loaded implicitly (query them explicitly instead)
+    transactions = relationship("Transaction", back_populates="ingest", lazy="raise")
 
 
 class Transaction(Base):
@@ -31,21 +33,118 @@ class Transaction(Base):
     id = Column(String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
     ingest_id = Column(String(36), ForeignKey("ingest.ingest_id"), nullable=False, index=True)
     date = Column(Date, nullable=False)
-    year_month = Column(String(7), nullable=False, index=True)  # Format: "YYYY-MM"
+    year_month = Column(String(7), nullable=False)  # Format: "YYYY-MM"
+    # year * 12 + month (see app.utils.dates.month_key); all month filters and
+    # indexes use this instead of the year_month string. Derived from year_month
+    # when an insert doesn't supply it
+    month_key = Column(
+        Integer,
+        nullable=False,
+        default=lambda context: year_month_key(context.get_current_parameters()["year_month"])
+    )
     amount = Column(Numeric(10, 2), nullable=False)
-    abs_amount = Column(Numeric(10, 2), nullable=False)
     where_ = Column(String(255), nullable=True, index=True)  # Maps to "Where?" CSV column
     what_ = Column(String(255), nullable=True)  # Maps to "What?" CSV column
     category = Column(String(100), nullable=True, index=True)
     source = Column(String(100), nullable=True, index=True)
-    raw_row = Column(Text, nullable=True)  # Store original CSV row as JSON string
     
-    # Relationship to ingest
-    ingest = relationship("Ingest", back_populates="transactions")
+    # Relationship to ingest; lazy="raise" turns an accidental per-row lazy load
+    # (N+1 queries) into an error
+    ingest = relationship("Ingest", back_populates="transactions", lazy="raise")
     
     # Composite indexes for month filtering
     __table_args__ = (
-        Index("idx_category_year_month", "category", "year_month"),
-        Index("idx_where_year_month", "where_", "year_month"),
-        Index("idx_source_year_month", "source", "year_month"),
+        Index("idx_category_month_key", "category", "month_key"),
+        Index("idx_where_month_key", "where_", "month_key"),
+        Index("idx_source_month_key", "source", "month_key"),
+        # Covering indexes for the per-month aggregates: filter on month_key,
+        # group by the column, and sum amount without touching the table
+        Index("idx_month_key_category_amount", "month_key", "category", "amount"),
+        Index("idx_month_key_source_amount", "month_key", "source", "amount"),
+        Index("idx_month_key_where_amount", "month_key", "where_", "amount"),
+        # Expression index for the case-insensitive merchant lookup
+        # (lower(where_) == merchant.lower() in get_merchant_total)
+        Index("idx_month_key_where_lower_amount", "month_key", func.lower(where_), "amount"),
+        # Evidence ordering (abs(amount) DESC, date DESC within a month): the
+        # expression index is walked backwards and the scan stops at LIMIT, with no
+        # sort step. Partial indexes, one per evidence kind, so every entry walked
+        # already passes the amount > 0 / amount < 0 filter
+        Index(
+            "idx_month_key_abs_amount_date_expense", "month_key", func.abs(amount), "date",
+            sqlite_where=text("amount > 0"), postgresql_where=text("amount > 0")
+        ),
+        Index(
+            "idx_month_key_abs_amount_date_income", "month_key", func.abs(amount), "date",
+            sqlite_where=text("amount < 0"), postgresql_where=text("amount < 0")
+        ),
+    )
+
+
+class TransactionRaw(Base):
+    """
+    Original CSV row for a transaction, stored as a JSON string.
+    
+    Kept out of the transactions table so that scans and aggregates over
+    transactions never read the raw text.
+    """
+    __tablename__ = "transaction_raw"
+    
+    transaction_id = Column(String(36), ForeignKey("transactions.id"), primary_key=True)
+    ingest_id = Column(String(36), ForeignKey("ingest.ingest_id"), nullable=False, index=True)
+    raw_row = Column(Text, nullable=False)
+
+
+class MonthlySummary(Base):
+    """Per-month totals rollup, refreshed on ingest. A row marks the month as rolled up."""
+    __tablename__ = "monthly_summary"
+    
+    year_month = Column(String(7), primary_key=True)  # Format: "YYYY-MM"
+    expense_total = Column(Numeric(12, 2), nullable=False)
+    income_total = Column(Numeric(12, 2), nullable=False)
+    net_total = Column(Numeric(12, 2), nullable=False)
+    transaction_count = Column(Integer, nullable=False)
+
+
+class MonthlyCategoryTotal(Base):
+    """Per-month expense rollup by category, refreshed on ingest."""
+    __tablename__ = "monthly_by_category"
+    
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    year_month = Column(String(7), nullable=False)
+    category = Column(String(100), nullable=True)
+    expense_total = Column(Numeric(12, 2), nullable=False)
+    count = Column(Integer, nullable=False)
+    
+    __table_args__ = (
+        Index("idx_monthly_by_category_ym", "year_month", "category"),
+    )
+
+
+class MonthlySourceTotal(Base):
+    """Per-month expense rollup by source, refreshed on ingest."""
+    __tablename__ = "monthly_by_source"
+    
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    year_month = Column(String(7), nullable=False)
+    source = Column(String(100), nullable=True)
+    expense_total = Column(Numeric(12, 2), nullable=False)
+    count = Column(Integer, nullable=False)
+    
+    __table_args__ = (
+        Index("idx_monthly_by_source_ym", "year_month", "source"),
+    )
+
+
+class MonthlyMerchantTotal(Base):
+    """Per-month expense rollup by merchant (where_), refreshed on ingest."""
+    __tablename__ = "monthly_by_merchant"
+    
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    year_month = Column(String(7), nullable=False)
+    where_ = Column(String(255), nullable=True)
+    expense_total = Column(Numeric(12, 2), nullable=False)
+    count = Column(Integer, nullable=False)
+    
+    __table_args__ = (
+        Index("idx_monthly_by_merchant_ym", "year_month", "where_"),
     )
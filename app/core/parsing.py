@@ -1,14 +1,51 @@
-import json
+import os
 import uuid
-from decimal import Decimal
-from typing import List, Dict, Any
+from decimal import Decimal, InvalidOperation
+from typing import List, Dict, Any, BinaryIO, Iterator
+import numpy as np
 import pandas as pd
 
-from app.utils.dates import parse_date
-from app.utils.money import parse_amount
+try:
+    import pyarrow  # noqa: F401
+    PYARROW_AVAILABLE = True
+except ImportError:
+    PYARROW_AVAILABLE = False
+
+from app.utils.dates import parse_date, month_key, year_month_from_key
+from app.utils.money import CENT, parse_amount
 
 REQUIRED_COLUMNS = ["Date", "Amount", "Where?", "What?", "Category", "Source"]
 
+# CSV date format, e.g. "Sat, 24 Jun 2025" (see app.utils.dates.parse_date)
+DATE_FORMAT = "%a, %d %b %Y"
+
+# Rows parsed, normalized, and inserted per batch during ingest
+CSV_CHUNK_SIZE = 50_000
+
+
+def iter_transactions_csv(source: BinaryIO, chunksize: int = CSV_CHUNK_SIZE) -> Iterator[pd.DataFrame]:
+    """
+    Stream an uploaded CSV file object as a sequence of DataFrame chunks.
+    
+    Parses directly from the file object, so peak memory is bounded by the chunk
+    size rather than the size of the upload. Chunk indexes continue across chunks,
+    so row numbers in normalize_transactions errors refer to the whole file.
+    
+    When pyarrow is installed, columns are read as Arrow-backed dtypes instead of
+    Python objects. The C parser is kept because pandas' pyarrow engine cannot
+    read in chunks.
+    
+    Args:
+        source: Binary file-like object positioned at the start of the CSV
+        chunksize: Number of rows per chunk
+        
+    Returns:
+        Iterator of pandas DataFrames with the raw CSV columns
+    """
+    read_kwargs = {"dtype_backend": "pyarrow"} if PYARROW_AVAILABLE else {}
+    with pd.read_csv(source, chunksize=chunksize, **read_kwargs) as reader:
+        yield from reader
+
 
 def validate_columns(df: pd.DataFrame) -> None:
     """
@@ -33,74 +70,164 @@ def validate_columns(df: pd.DataFrame) -> None:
         )
 
 
+def _column_as_str(series: pd.Series) -> np.ndarray:
+    """Stringify a column the way the CSV parsers expect, mapping missing values to ""."""
+    return series.astype(str).where(series.notna(), "").to_numpy(dtype=object)
+
+
+def _column_as_optional_str(series: pd.Series) -> np.ndarray:
+    """Stringify a text column like str(value), mapping missing values to None."""
+    # astype("string") rather than astype(str): nullable Arrow integer columns would
+    # otherwise go through float and render 1 as "1.0"
+    values = series.astype("string").to_numpy(dtype=object)
+    values[series.isna().to_numpy()] = None
+    return values
+
+
+def _uuid4_batch(n: int) -> List[str]:
+    """Generate n random (version 4) UUID strings from a single os.urandom draw."""
+    entropy = os.urandom(16 * n)
+    return [str(uuid.UUID(bytes=entropy[i:i + 16], version=4)) for i in range(0, 16 * n, 16)]
+
+
+def _row_error(df: pd.DataFrame, pos: int, error: Exception) -> ValueError:
+    """Build the user-facing error for a row that failed to normalize."""
+    idx = df.index[pos]
+    # Include row index (0-based) in error message for debugging
+    row_num = idx + 1  # Convert to 1-based for user-friendly error message
+    return ValueError(
+        f"Error processing row {row_num} (0-based index: {idx}): {str(error)}. "
+        f"Row data: {df.iloc[pos].to_dict()}"
+    )
+
+
 def normalize_transactions(df: pd.DataFrame, ingest_id: str) -> List[Dict[str, Any]]:
     """
     Normalize CSV dataframe rows into Transaction model-ready dictionaries.
     
+    Dates and amounts are parsed column-wise; any value the vectorized path
+    rejects is re-parsed with parse_date/parse_amount so that error messages
+    are identical to the scalar parsers.
+    
     Args:
         df: pandas DataFrame with required columns
         ingest_id: UUID string of the ingest record
         
     Returns:
-        List of dictionaries ready for Transaction model insertion
+        List of dictionaries ready for Transaction model insertion. Keys are
+        exactly the transactions table's column names, so the list can be passed
+        straight to a Core executemany: db.execute(Transaction.__table__.insert(), rows)
         
     Raises:
         ValueError: If parsing fails, with row index information for debugging
     """
     validate_columns(df)
     
-    transactions = []
+    # Parse dates in one vectorized strptime pass (cache=True memoizes repeated strings)
+    date_strs = _column_as_str(df["Date"])
+    dates = pd.to_datetime(
+        pd.Series(date_strs, dtype=object).str.strip(),
+        format=DATE_FORMAT,
+        errors="coerce",
+        cache=True,
+    )
+    parsed_dates = dates.dt.date.to_numpy(dtype=object)
+    # Integer month_key per row; year_month is derived from it below
+    month_keys = (dates.dt.year * 12 + dates.dt.month).to_numpy(dtype=float)
     
-    for idx, row in df.iterrows():
+    date_error = None
+    for pos in np.flatnonzero(dates.isna().to_numpy()):
         try:
-            # Parse date
-            date_str = str(row["Date"]) if pd.notna(row["Date"]) else ""
-            parsed_date = parse_date(date_str)
-            
-            # Derive year_month as "YYYY-MM"
-            year_month = parsed_date.strftime("%Y-%m")
-            
-            # Parse amount
-            amount_str = str(row["Amount"]) if pd.notna(row["Amount"]) else ""
-            amount = parse_amount(amount_str)
-            
-            # Compute abs_amount
-            abs_amount = abs(amount)
-            
-            # Map CSV columns to model fields
-            where_ = str(row["Where?"]) if pd.notna(row["Where?"]) else None
-            what_ = str(row["What?"]) if pd.notna(row["What?"]) else None
-            category = str(row["Category"]) if pd.notna(row["Category"]) else None
-            source = str(row["Source"]) if pd.notna(row["Source"]) else None
-            
-            # Convert row to dict and store as JSON string
-            raw_row = json.dumps(row.to_dict())
-            
-            # Generate UUID for transaction id
-            transaction_id = str(uuid.uuid4())
-            
-            transaction = {
-                "id": transaction_id,
-                "ingest_id": ingest_id,
-                "date": parsed_date,
-                "year_month": year_month,
-                "amount": amount,
-                "abs_amount": abs_amount,
-                "where_": where_,
-                "what_": what_,
-                "category": category,
-                "source": source,
-                "raw_row": raw_row,
-            }
-            
-            transactions.append(transaction)
-            
-        except Exception as e:
-            # Include row index (0-based) in error message for debugging
-            row_num = idx + 1  # Convert to 1-based for user-friendly error message
-            raise ValueError(
-                f"Error processing row {row_num} (0-based index: {idx}): {str(e)}. "
-                f"Row data: {row.to_dict()}"
-            ) from e
-    
-    return transactions
+            parsed_date = parse_date(date_strs[pos])
+        except ValueError as e:
+            date_error = (pos, e)
+            break
+        parsed_dates[pos] = parsed_date
+        month_keys[pos] = month_key(parsed_date.year, parsed_date.month)
+    
+    # Strip currency symbols column-wise, then build the Decimals in a single pass
+    amount_strs = _column_as_str(df["Amount"])
+    cleaned_amounts = (
+        pd.Series(amount_strs, dtype=object)
+        .str.strip()
+        .str.replace("$", "", regex=False)
+        .str.replace(",", "", regex=False)
+    )
+    amount_error = None
+    try:
+        amounts = [Decimal(value).quantize(CENT) for value in cleaned_amounts]
+    except InvalidOperation:
+        # Fall back to the scalar parser to locate and describe the bad value
+        amounts = []
+        for pos, value in enumerate(amount_strs):
+            try:
+                amounts.append(parse_amount(value))
+            except ValueError as e:
+                amount_error = (pos, e)
+                break
+    
+    # Report the first failing row; a bad date wins over a bad amount on the same row
+    errors = [error for error in (date_error, amount_error) if error is not None]
+    if errors:
+        pos, error = min(errors, key=lambda item: item[0])
+        raise _row_error(df, pos, error) from error
+    
+    # Map CSV columns to model fields
+    text_columns = [
+        _column_as_optional_str(df[column])
+        for column in ("Where?", "What?", "Category", "Source")
+    ]
+    
+    # One entropy draw for the whole chunk instead of one per uuid4() call
+    ids = _uuid4_batch(len(df))
+    # Every date parsed by now, so no NaN keys remain
+    month_keys = month_keys.astype(np.int64).tolist()
+    # Format "YYYY-MM" once per distinct month rather than once per row
+    month_labels = {key: year_month_from_key(key) for key in set(month_keys)}
+    year_months = [month_labels[key] for key in month_keys]
+    
+    return [
+        {
+            "id": transaction_id,
+            "ingest_id": ingest_id,
+            "date": parsed_date,
+            "year_month": year_month,
+            "month_key": key,
+            "amount": amount,
+            "where_": where_,
+            "what_": what_,
+            "category": category,
+            "source": source,
+        }
+        for transaction_id, parsed_date, year_month, key, amount, where_, what_, category, source in zip(
+            ids, parsed_dates, year_months, month_keys, amounts, *text_columns
+        )
+    ]
+
+
+def raw_transaction_rows(df: pd.DataFrame, transactions: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    Build TransactionRaw rows holding each original CSV row as a JSON string.
+    
+    The whole chunk is encoded in one to_json call (one record per line; newlines
+    inside values are escaped), then paired with the ids of the normalized rows.
+    
+    Args:
+        df: pandas DataFrame passed to normalize_transactions
+        transactions: Rows returned by normalize_transactions for df, in order
+        
+    Returns:
+        List of dictionaries ready for a Core insert into transaction_raw
+    """
+    if not transactions:
+        return []
+    
+    raw_rows = df.to_json(orient="records", lines=True, double_precision=15).rstrip("\n").split("\n")
+    return [
+        {
+            "transaction_id": transaction["id"],
+            "ingest_id": transaction["ingest_id"],
+            "raw_row": raw_row,
+        }
+        for transaction, raw_row in zip(transactions, raw_rows)
+    ]
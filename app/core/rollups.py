@@ -0,0 +1,86 @@
+from typing import Iterable
+from sqlalchemy import and_, case, func, insert, literal, select
+from sqlalchemy.orm import Session
+
+from app.core.models import (
+    Transaction,
+    MonthlySummary,
+    MonthlyCategoryTotal,
+    MonthlySourceTotal,
+    MonthlyMerchantTotal,
+)
+from app.utils.dates import year_month_key
+
+ROLLUP_MODELS = (MonthlySummary, MonthlyCategoryTotal, MonthlySourceTotal, MonthlyMerchantTotal)
+
+
+def clear_monthly_rollups(db: Session) -> None:
+    """Delete every rollup row (used when all transactions are replaced)."""
+    for model in ROLLUP_MODELS:
+        db.query(model).delete(synchronize_session=False)
+
+
+def refresh_monthly_rollups(db: Session, months: Iterable[str]) -> None:
+    """
+    Recompute the per-month rollup tables for the given months.
+
+    Each month is rebuilt from the transactions table (delete + INSERT ... SELECT),
+    so the rollups always equal what the live metric queries would return. Runs in
+    the caller's transaction; the caller is responsible for committing.
+
+    Args:
+        db: SQLAlchemy database session
+        months: Months in "YYYY-MM" format whose transactions changed
+    """
+    months = sorted(set(months))
+    if not months:
+        return
+
+    for model in ROLLUP_MODELS:
+        db.query(model).filter(model.year_month.in_(months)).delete(synchronize_session=False)
+
+    # Rebuild one month at a time so every query filters on month_key alone and
+    # is served by the (month_key, ...) covering indexes
+    for month in months:
+        in_month = Transaction.month_key == year_month_key(month)
+        expenses_in_month = and_(in_month, Transaction.amount > 0)
+
+        # Totals: one row per month, also marking the month as rolled up
+        db.execute(
+            insert(MonthlySummary).from_select(
+                ["year_month", "expense_total", "income_total", "net_total", "transaction_count"],
+                select(
+                    literal(month),
+                    func.coalesce(func.sum(case((Transaction.amount > 0, Transaction.amount), else_=0)), 0),
+                    func.coalesce(func.sum(case((Transaction.amount < 0, Transaction.amount), else_=0)), 0),
+                    func.coalesce(func.sum(Transaction.amount), 0),
+                    func.count(),
+                ).where(in_month).having(func.count() > 0)
+            )
+        )
+
+        # Expense breakdowns by category, source, and merchant (NULL groups included,
+        # matching the GROUP BY semantics of the live queries)
+        for model, column in (
+            (MonthlyCategoryTotal, Transaction.category),
+            (MonthlySourceTotal, Transaction.source),
+            (MonthlyMerchantTotal, Transaction.where_),
+        ):
+            db.execute(
+                insert(model).from_select(
+                    ["year_month", column.key, "expense_total", "count"],
+                    select(
+                        literal(month),
+                        column,
+                        func.sum(Transaction.amount),
+                        func.count(),
+                    ).where(expenses_in_month).group_by(column)
+                )
+            )
+
+
+def has_monthly_rollup(db: Session, month: str) -> bool:
+    """Return True if the rollup tables have been populated for the month."""
+    return db.query(MonthlySummary.year_month).filter(
+        MonthlySummary.year_month == month
+    ).first() is not None
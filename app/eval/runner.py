@@ -3,38 +3,113 @@
 Evaluation runner for query endpoint.
 Tests questions from questions_v1.jsonl against the /query endpoint.
 """
+import asyncio
+import atexit
 import json
 import sys
 import argparse
+import importlib.util
 from pathlib import Path
 from decimal import Decimal
-from typing import Dict, Any, List, Optional, Callable
+from typing import Dict, Any, Iterator, List, Optional, Callable
 from datetime import date
-from fastapi.testclient import TestClient
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker
+from collections import defaultdict
+from functools import lru_cache
+from sqlalchemy import create_engine, event, func, select
+from sqlalchemy.orm import Session, sessionmaker
 from sqlalchemy.pool import StaticPool
 import uuid
 
 # Add parent directory to path to import app modules
 sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 
-from app.main import app
-from app.core.db import Base, get_db, engine, SessionLocal
+from app.core.db import (
+    Base, get_db, get_read_db, engine, SessionLocal, apply_sqlite_pragmas, analyze_database
+)
+from app.core.cache import invalidate_caches
 from app.core.config import get_settings
 from app.core.models import Transaction, Ingest
 from app.core.metrics import (
+    _month_expenses,
+    _validate_month,
     get_monthly_totals,
     get_category_total,
     get_merchant_total,
     get_source_total
 )
+from app.utils.money import CENT
+
+# The FastAPI app (which pulls in pandas through the ingest route), TestClient and
+# httpx are imported only by the mode that needs them, so --help and remote runs
+# skip the in-process stack
+HTTPX_AVAILABLE = importlib.util.find_spec("httpx") is not None
 
 try:
-    import httpx
-    HTTPX_AVAILABLE = True
+    import orjson
+    ORJSON_AVAILABLE = True
 except ImportError:
-    HTTPX_AVAILABLE = False
+    ORJSON_AVAILABLE = False
+
+# Expected question types that ask for clarification
+CLARIFY_TYPES = frozenset(("clarify_month", "clarify_entity"))
+# Expect types checked against the DB -> (metric function, expect key of its entity argument or
+# None, field holding the count in both the response numbers and the metric result)
+NUMERIC_CHECKS = {
+    "category_total": (get_category_total, "category", "count"),
+    "merchant_total": (get_merchant_total, "merchant", "count"),
+    "source_total": (get_source_total, "source", "count"),
+    "monthly_summary": (get_monthly_totals, None, "transaction_count"),
+}
+NUMERIC_TYPES = frozenset(NUMERIC_CHECKS)
+# Entity metric -> column its per-month GROUP BY uses (merchants match case-insensitively)
+ENTITY_GROUP_COLUMNS = {
+    get_category_total: Transaction.category,
+    get_merchant_total: func.lower(Transaction.where_),
+    get_source_total: Transaction.source,
+}
+
+ZERO_TOTAL = Decimal("0.00")
+
+# Remote mode: requests in flight at once, and the connection pool cap behind them
+REMOTE_CONCURRENCY = 16
+REMOTE_MAX_CONNECTIONS = 64
+
+# In-process clients by (db_mode, db_url), so repeated run_evaluation calls reuse
+# the TestClient and seeded database instead of building them again. Values are
+# (call_query, get_db_session, data_mode, session factory to override get_db with)
+_CLIENT_CACHE: Dict[tuple, tuple] = {}
+
+
+def override_db_dependencies(session_factory: sessionmaker) -> None:
+    """
+    Point the app's get_db and get_read_db dependencies at another database.
+    
+    Args:
+        session_factory: Session factory bound to the database to serve requests from
+    """
+    from app.main import app
+    
+    def override_get_db():
+        db = session_factory()
+        try:
+            yield db
+        finally:
+            db.close()
+    
+    app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[get_read_db] = override_get_db
+    # Cached read-path results belong to whatever database was active before
+    invalidate_caches()
+
+
+def restore_db_dependencies() -> None:
+    """Undo override_db_dependencies, pointing the app back at its own database."""
+    from app.main import app
+    
+    app.dependency_overrides.pop(get_db, None)
+    app.dependency_overrides.pop(get_read_db, None)
+    # Cached read-path results belong to the overriding database
+    invalidate_caches()
 
 
 def setup_seeded_database():
@@ -44,13 +119,12 @@ def setup_seeded_database():
         connect_args={"check_same_thread": False},
         poolclass=StaticPool
     )
+    # Same connection tuning as the app's engine (page cache, in-memory temp store)
+    event.listen(test_engine, "connect", apply_sqlite_pragmas)
     Base.metadata.create_all(bind=test_engine)
     test_session_local = sessionmaker(autocommit=False, autoflush=False, bind=test_engine)
     
-    # Seed database with sample transactions
-    session = test_session_local()
-    
-    # Create an ingest record
+    # Seed database with sample transactions, all under one ingest record
     ingest_id = str(uuid.uuid4())
     ingest = Ingest(
         ingest_id=ingest_id,
@@ -59,156 +133,142 @@ def setup_seeded_database():
         status="success",
         error=None
     )
-    session.add(ingest)
-    session.flush()
     
     # Create sample transactions for 2025-06
     transactions = [
         # Food transactions
-        Transaction(
-            id=str(uuid.uuid4()),
-            ingest_id=ingest_id,
-            date=date(2025, 6, 5),
-            year_month="2025-06",
-            amount=Decimal("45.50"),
-            abs_amount=Decimal("45.50"),
-            where_="Grocery Store",
-            what_="Groceries",
-            category="Food",
-            source="Credit Card"
-        ),
-        Transaction(
-            id=str(uuid.uuid4()),
-            ingest_id=ingest_id,
-            date=date(2025, 6, 10),
-            year_month="2025-06",
-            amount=Decimal("25.00"),
-            abs_amount=Decimal("25.00"),
-            where_="Restaurant",
-            what_="Dinner",
-            category="Food",
-            source="Cash"
-        ),
+        {
+            "id": str(uuid.uuid4()),
+            "ingest_id": ingest_id,
+            "date": date(2025, 6, 5),
+            "year_month": "2025-06",
+            "amount": Decimal("45.50"),
+            "where_": "Grocery Store",
+            "what_": "Groceries",
+            "category": "Food",
+            "source": "Credit Card",
+        },
+        {
+            "id": str(uuid.uuid4()),
+            "ingest_id": ingest_id,
+            "date": date(2025, 6, 10),
+            "year_month": "2025-06",
+            "amount": Decimal("25.00"),
+            "where_": "Restaurant",
+            "what_": "Dinner",
+            "category": "Food",
+            "source": "Cash",
+        },
         # Travel transaction
-        Transaction(
-            id=str(uuid.uuid4()),
-            ingest_id=ingest_id,
-            date=date(2025, 6, 15),
-            year_month="2025-06",
-            amount=Decimal("300.00"),
-            abs_amount=Decimal("300.00"),
-            where_="Airline",
-            what_="Flight",
-            category="Travel",
-            source="Credit Card"
-        ),
+        {
+            "id": str(uuid.uuid4()),
+            "ingest_id": ingest_id,
+            "date": date(2025, 6, 15),
+            "year_month": "2025-06",
+            "amount": Decimal("300.00"),
+            "where_": "Airline",
+            "what_": "Flight",
+            "category": "Travel",
+            "source": "Credit Card",
+        },
         # Uber transactions
-        Transaction(
-            id=str(uuid.uuid4()),
-            ingest_id=ingest_id,
-            date=date(2025, 6, 8),
-            year_month="2025-06",
-            amount=Decimal("15.50"),
-            abs_amount=Decimal("15.50"),
-            where_="Uber",
-            what_="Ride",
-            category="Travel",
-            source="Credit Card"
-        ),
-        Transaction(
-            id=str(uuid.uuid4()),
-            ingest_id=ingest_id,
-            date=date(2025, 6, 12),
-            year_month="2025-06",
-            amount=Decimal("22.00"),
-            abs_amount=Decimal("22.00"),
-            where_="Uber",
-            what_="Ride",
-            category="Travel",
-            source="Credit Card"
-        ),
+        {
+            "id": str(uuid.uuid4()),
+            "ingest_id": ingest_id,
+            "date": date(2025, 6, 8),
+            "year_month": "2025-06",
+            "amount": Decimal("15.50"),
+            "where_": "Uber",
+            "what_": "Ride",
+            "category": "Travel",
+            "source": "Credit Card",
+        },
+        {
+            "id": str(uuid.uuid4()),
+            "ingest_id": ingest_id,
+            "date": date(2025, 6, 12),
+            "year_month": "2025-06",
+            "amount": Decimal("22.00"),
+            "where_": "Uber",
+            "what_": "Ride",
+            "category": "Travel",
+            "source": "Credit Card",
+        },
         # Target transaction
-        Transaction(
-            id=str(uuid.uuid4()),
-            ingest_id=ingest_id,
-            date=date(2025, 6, 20),
-            year_month="2025-06",
-            amount=Decimal("85.00"),
-            abs_amount=Decimal("85.00"),
-            where_="Target",
-            what_="Shopping",
-            category="Essentials",
-            source="Credit Card"
-        ),
+        {
+            "id": str(uuid.uuid4()),
+            "ingest_id": ingest_id,
+            "date": date(2025, 6, 20),
+            "year_month": "2025-06",
+            "amount": Decimal("85.00"),
+            "where_": "Target",
+            "what_": "Shopping",
+            "category": "Essentials",
+            "source": "Credit Card",
+        },
         # Amazon transaction
-        Transaction(
-            id=str(uuid.uuid4()),
-            ingest_id=ingest_id,
-            date=date(2025, 6, 18),
-            year_month="2025-06",
-            amount=Decimal("120.00"),
-            abs_amount=Decimal("120.00"),
-            where_="Amazon",
-            what_="Online Purchase",
-            category="Home",
-            source="Chase"
-        ),
+        {
+            "id": str(uuid.uuid4()),
+            "ingest_id": ingest_id,
+            "date": date(2025, 6, 18),
+            "year_month": "2025-06",
+            "amount": Decimal("120.00"),
+            "where_": "Amazon",
+            "what_": "Online Purchase",
+            "category": "Home",
+            "source": "Chase",
+        },
         # Cash transaction
-        Transaction(
-            id=str(uuid.uuid4()),
-            ingest_id=ingest_id,
-            date=date(2025, 6, 22),
-            year_month="2025-06",
-            amount=Decimal("50.00"),
-            abs_amount=Decimal("50.00"),
-            where_="Coffee Shop",
-            what_="Coffee",
-            category="Food",
-            source="Cash"
-        ),
+        {
+            "id": str(uuid.uuid4()),
+            "ingest_id": ingest_id,
+            "date": date(2025, 6, 22),
+            "year_month": "2025-06",
+            "amount": Decimal("50.00"),
+            "where_": "Coffee Shop",
+            "what_": "Coffee",
+            "category": "Food",
+            "source": "Cash",
+        },
         # Chase transaction
-        Transaction(
-            id=str(uuid.uuid4()),
-            ingest_id=ingest_id,
-            date=date(2025, 6, 25),
-            year_month="2025-06",
-            amount=Decimal("200.00"),
-            abs_amount=Decimal("200.00"),
-            where_="Store",
-            what_="Purchase",
-            category="Personal",
-            source="Chase"
-        ),
+        {
+            "id": str(uuid.uuid4()),
+            "ingest_id": ingest_id,
+            "date": date(2025, 6, 25),
+            "year_month": "2025-06",
+            "amount": Decimal("200.00"),
+            "where_": "Store",
+            "what_": "Purchase",
+            "category": "Personal",
+            "source": "Chase",
+        },
         # Starbucks transaction
-        Transaction(
-            id=str(uuid.uuid4()),
-            ingest_id=ingest_id,
-            date=date(2025, 6, 28),
-            year_month="2025-06",
-            amount=Decimal("8.50"),
-            abs_amount=Decimal("8.50"),
-            where_="Starbucks",
-            what_="Coffee",
-            category="Food",
-            source="Credit Card"
-        ),
+        {
+            "id": str(uuid.uuid4()),
+            "ingest_id": ingest_id,
+            "date": date(2025, 6, 28),
+            "year_month": "2025-06",
+            "amount": Decimal("8.50"),
+            "where_": "Starbucks",
+            "what_": "Coffee",
+            "category": "Food",
+            "source": "Credit Card",
+        },
     ]
     
-    for transaction in transactions:
-        session.add(transaction)
+    # Write the whole seed in one transaction, committed (and the session closed)
+    # when the block exits
+    with test_session_local.begin() as session:
+        session.add(ingest)
+        session.flush()
+        # Insert every row in one Core executemany (no per-object ORM bookkeeping)
+        session.execute(Transaction.__table__.insert(), transactions)
+        # create_all already built the model's month_key indexes; give the planner
+        # statistics for them, as ingest does after its bulk insert
+        analyze_database(session)
     
-    session.commit()
-    session.close()
-    
-    # Override get_db dependency
-    def override_get_db():
-        db = test_session_local()
-        try:
-            yield db
-        finally:
-            db.close()
-    
-    app.dependency_overrides[get_db] = override_get_db
+    # Override get_db and get_read_db dependencies
+    override_db_dependencies(test_session_local)
     
     return test_session_local
 
@@ -217,7 +277,7 @@ def setup_real_database(db_url: Optional[str] = None):
     """
     Set up connection to real database (no seeding).
     
-    If db_url is provided, override get_db to use that database.
+    If db_url is provided, override get_db and get_read_db to use that database.
     Otherwise, use the existing app database without override.
     """
     if db_url:
@@ -227,17 +287,13 @@ def setup_real_database(db_url: Optional[str] = None):
             connect_args = {"check_same_thread": False}
         
         real_engine = create_engine(db_url, connect_args=connect_args)
+        if db_url.startswith("sqlite"):
+            # Same connection tuning as the app's engine
+            event.listen(real_engine, "connect", apply_sqlite_pragmas)
         real_session_local = sessionmaker(autocommit=False, autoflush=False, bind=real_engine)
         
-        # Override get_db to use the custom database
-        def override_get_db():
-            db = real_session_local()
-            try:
-                yield db
-            finally:
-                db.close()
-        
-        app.dependency_overrides[get_db] = override_get_db
+        # Override get_db and get_read_db to use the custom database
+        override_db_dependencies(real_session_local)
     else:
         # Use the existing app database without override
         real_session_local = SessionLocal
@@ -247,15 +303,24 @@ def setup_real_database(db_url: Optional[str] = None):
     return real_session_local
 
 
-def load_questions(jsonl_path: Path) -> List[Dict[str, Any]]:
-    """Load questions from JSONL file."""
-    questions = []
-    with open(jsonl_path, 'r') as f:
+def load_questions(jsonl_path: Path) -> Iterator[Dict[str, Any]]:
+    """Yield questions from a JSONL file one line at a time."""
+    loads = orjson.loads if ORJSON_AVAILABLE else json.loads
+    with open(jsonl_path, 'rb') as f:
         for line in f:
-            line = line.strip()
-            if line:
-                questions.append(json.loads(line))
-    return questions
+            if line.strip():
+                yield loads(line)
+
+
+def build_query_request(question_data: Dict[str, Any]) -> Dict[str, Any]:
+    """Build the /query request body for one question."""
+    request_data = {
+        "question": question_data["question"],
+        "limit_evidence": 10
+    }
+    if question_data.get("month"):
+        request_data["month"] = question_data["month"]
+    return request_data
 
 
 def check_trace_present(response_data: Dict[str, Any]) -> tuple[bool, str]:
@@ -301,8 +366,7 @@ def check_evidence_rule(response_data: Dict[str, Any]) -> tuple[bool, str]:
 
 def check_intent_match(response_data: Dict[str, Any], expect_type: str) -> tuple[bool, str]:
     """Check if response intent matches expected type for non-clarify cases."""
-    clarify_types = ["clarify_month", "clarify_entity"]
-    if expect_type in clarify_types:
+    if expect_type in CLARIFY_TYPES:
         return True, "pass"  # Skip for clarify cases
     
     trace = response_data.get("trace", {})
@@ -314,15 +378,79 @@ def check_intent_match(response_data: Dict[str, Any], expect_type: str) -> tuple
     return True, "pass"
 
 
+def memoize_expected_metrics(db: Session) -> Callable:
+    """
+    Build a memoized way to compute expected metric values for one eval run.
+    
+    Category, merchant and source totals are computed for a whole month at once,
+    with one GROUP BY per dimension the first time that month and dimension come
+    up, and later questions look their entity up in the result. Monthly totals
+    run get_monthly_totals once per month. Results are not shared between runs,
+    which may use different databases.
+    
+    Args:
+        db: Database session shared by all checks in a run
+        
+    Returns:
+        Function (metric, month, *args) returning the same value as
+        metric(db, month, *args)
+    """
+    @lru_cache(maxsize=None)
+    def monthly_totals(month: str) -> Dict[str, Any]:
+        return get_monthly_totals(db, month)
+    
+    @lru_cache(maxsize=None)
+    def entity_totals(metric: Callable, month: str) -> Dict[Optional[str], Dict[str, Any]]:
+        group_column = ENTITY_GROUP_COLUMNS[metric]
+        rows = db.execute(
+            select(group_column, func.sum(Transaction.amount), func.count())
+            .where(_month_expenses(_validate_month(month)))
+            .group_by(group_column)
+        ).all()
+        return {
+            entity: {"expense_total": Decimal(total).quantize(CENT), "count": count}
+            for entity, total, count in rows
+        }
+    
+    def expected_metric(metric: Callable, month: str, *args: str) -> Dict[str, Any]:
+        if metric is get_monthly_totals:
+            return monthly_totals(month)
+        entity = args[0].lower() if metric is get_merchant_total else args[0]
+        return entity_totals(metric, month).get(entity, {"expense_total": ZERO_TOTAL, "count": 0})
+    
+    return expected_metric
+
+
+def _as_decimal(value: Any) -> Decimal:
+    """Convert a JSON amount to Decimal; only floats go through str (for their shortest repr)."""
+    if isinstance(value, Decimal):
+        return value
+    if isinstance(value, (str, int)):
+        return Decimal(value)
+    return Decimal(str(value))
+
+
 def check_numeric_correctness(
     response_data: Dict[str, Any],
     expect: Dict[str, Any],
-    db_session_factory
+    db: Session,
+    expected_metric: Callable
 ) -> tuple[bool, str]:
-    """Check numeric correctness by comparing to actual DB queries."""
+    """
+    Check numeric correctness by comparing to actual DB queries.
+    
+    Args:
+        response_data: JSON body returned by /query
+        expect: Expected outcome from the question file
+        db: Database session shared by all checks in a run
+        expected_metric: Memoized metric lookup from memoize_expected_metrics(db)
+        
+    Returns:
+        Tuple of (passed, message)
+    """
     expect_type = expect.get("type")
     
-    if expect_type not in ["category_total", "merchant_total", "source_total", "monthly_summary"]:
+    if expect_type not in NUMERIC_TYPES:
         return True, "pass"  # Not a numeric check case
     
     trace = response_data.get("trace", {})
@@ -334,83 +462,87 @@ def check_numeric_correctness(
     if not numbers:
         return False, "no numbers in response"
     
-    # Create a session for this check
-    db = db_session_factory()
+    metric, entity_key, count_field = NUMERIC_CHECKS[expect_type]
     try:
-        if expect_type == "category_total":
-            category = expect.get("category")
-            if not category:
-                return False, "category missing in expect"
-            expected = get_category_total(db, month, category)
-            actual_expense = Decimal(str(numbers.get("expense_total", "0")))
-            actual_count = numbers.get("count", 0)
-            if actual_expense != expected["expense_total"]:
-                return False, f"expense_total mismatch: expected {expected['expense_total']}, got {actual_expense}"
-            if actual_count != expected["count"]:
-                return False, f"count mismatch: expected {expected['count']}, got {actual_count}"
-        
-        elif expect_type == "merchant_total":
-            merchant = expect.get("merchant")
-            if not merchant:
-                return False, "merchant missing in expect"
-            expected = get_merchant_total(db, month, merchant)
-            actual_expense = Decimal(str(numbers.get("expense_total", "0")))
-            actual_count = numbers.get("count", 0)
-            if actual_expense != expected["expense_total"]:
-                return False, f"expense_total mismatch: expected {expected['expense_total']}, got {actual_expense}"
-            if actual_count != expected["count"]:
-                return False, f"count mismatch: expected {expected['count']}, got {actual_count}"
-        
-        elif expect_type == "source_total":
-            source = expect.get("source")
-            if not source:
-                return False, "source missing in expect"
-            expected = get_source_total(db, month, source)
-            actual_expense = Decimal(str(numbers.get("expense_total", "0")))
-            actual_count = numbers.get("count", 0)
-            if actual_expense != expected["expense_total"]:
-                return False, f"expense_total mismatch: expected {expected['expense_total']}, got {actual_expense}"
-            if actual_count != expected["count"]:
-                return False, f"count mismatch: expected {expected['count']}, got {actual_count}"
+        if entity_key is None:
+            expected = expected_metric(metric, month)
+        else:
+            entity = expect.get(entity_key)
+            if not entity:
+                return False, f"{entity_key} missing in expect"
+            expected = expected_metric(metric, month, entity)
         
-        elif expect_type == "monthly_summary":
-            expected = get_monthly_totals(db, month)
-            actual_expense = Decimal(str(numbers.get("expense_total", "0")))
-            actual_count = numbers.get("transaction_count", 0)
-            if actual_expense != expected["expense_total"]:
-                return False, f"expense_total mismatch: expected {expected['expense_total']}, got {actual_expense}"
-            if actual_count != expected["transaction_count"]:
-                return False, f"transaction_count mismatch: expected {expected['transaction_count']}, got {actual_count}"
+        actual_expense = _as_decimal(numbers.get("expense_total", "0"))
+        actual_count = numbers.get(count_field, 0)
+        if actual_expense != expected["expense_total"]:
+            return False, f"expense_total mismatch: expected {expected['expense_total']}, got {actual_expense}"
+        if actual_count != expected[count_field]:
+            return False, f"{count_field} mismatch: expected {expected[count_field]}, got {actual_count}"
         
         return True, "pass"
     
     except Exception as e:
+        # End the failed transaction so the shared session stays usable
+        db.rollback()
         return False, f"error computing expected: {str(e)}"
-    finally:
-        db.close()
 
 
-def create_remote_client(base_url: str) -> Callable:
-    """Create a client function for remote server using httpx."""
+def parse_response_body(response) -> Dict[str, Any]:
+    """Parse an httpx/TestClient response's JSON body, using orjson when it is installed."""
+    if ORJSON_AVAILABLE:
+        return orjson.loads(response.content)
+    return response.json()
+
+
+def create_remote_client(base_url: str, concurrency: int = REMOTE_CONCURRENCY) -> Callable:
+    """
+    Create a function that sends a batch of /query requests to a remote server.
+    
+    Requests go out concurrently over one shared httpx.AsyncClient, at most
+    `concurrency` at a time, so a run takes roughly the slowest round trip per
+    wave rather than the sum of all of them.
+    
+    Args:
+        base_url: Base URL of the remote server
+        concurrency: Maximum number of requests in flight at once
+        
+    Returns:
+        Function taking a list of request bodies and returning a list of
+        (response_data, status_code) tuples in the same order
+    """
     if not HTTPX_AVAILABLE:
         raise ImportError("httpx is required for remote server mode. Install with: pip install httpx")
+    import httpx
     
-    def call_query(request_data: Dict[str, Any]) -> tuple[Dict[str, Any], int]:
-        """Call /query endpoint on remote server."""
-        try:
-            with httpx.Client(timeout=30.0) as client:
-                response = client.post(f"{base_url}/query", json=request_data)
-                return response.json(), response.status_code
-        except Exception as e:
-            return {}, 500
-    
-    return call_query
+    async def call_queries_async(requests: List[Dict[str, Any]]) -> List[tuple[Dict[str, Any], int]]:
+        semaphore = asyncio.Semaphore(concurrency)
+        limits = httpx.Limits(max_connections=REMOTE_MAX_CONNECTIONS)
+        async with httpx.AsyncClient(base_url=base_url, timeout=30.0, limits=limits) as client:
+            async def call_query(request_data: Dict[str, Any]) -> tuple[Dict[str, Any], int]:
+                """Call /query endpoint on remote server."""
+                async with semaphore:
+                    try:
+                        response = await client.post("/query", json=request_data)
+                        return parse_response_body(response), response.status_code
+                    except Exception as e:
+                        return {}, 500
+            
+            return await asyncio.gather(*(call_query(request_data) for request_data in requests))
+    
+    def call_queries(requests: List[Dict[str, Any]]) -> List[tuple[Dict[str, Any], int]]:
+        """Call /query endpoint on remote server for every request concurrently."""
+        return asyncio.run(call_queries_async(requests))
+    
+    return call_queries
 
 
 def create_inprocess_client(db_mode: str = "real", db_url: Optional[str] = None) -> tuple[Callable, Callable, str]:
     """
     Create a client function for in-process testing using TestClient.
     
+    Clients are cached per (db_mode, db_url): later calls return the same client
+    and, in seeded mode, the same already-seeded database.
+    
     Args:
         db_mode: "real" or "seeded"
         db_url: Optional database URL for real mode
@@ -418,6 +550,15 @@ def create_inprocess_client(db_mode: str = "real", db_url: Optional[str] = None)
     Returns:
         Tuple of (call_query function, get_db_session function, data_mode string)
     """
+    cache_key = (db_mode, db_url)
+    cached = _CLIENT_CACHE.get(cache_key)
+    if cached is not None:
+        call_query, get_db_session, data_mode, override_factory = cached
+        if override_factory is not None:
+            # run_evaluation clears the overrides when it finishes, so reinstall them
+            override_db_dependencies(override_factory)
+        return call_query, get_db_session, data_mode
+    
     if db_mode == "seeded":
         # Setup seeded in-memory database
         db_session_factory = setup_seeded_database()
@@ -427,13 +568,27 @@ def create_inprocess_client(db_mode: str = "real", db_url: Optional[str] = None)
         db_session_factory = setup_real_database(db_url)
         data_mode = "real"
     
+    from fastapi.testclient import TestClient
+    from app.main import app
+    
+    # Only the seeded database and an explicit db_url replace the app's own database
+    overridden = db_mode == "seeded" or bool(db_url)
+
+    # Enter the client once: its event loop thread then serves every request
+    # instead of being started and stopped around each one. Entering also runs the
+    # app's startup hook, which creates and upgrades the app's configured database
+    # (app.core.migrations.init_database), so the client is entered only when that
+    # database is the one being evaluated
     client = TestClient(app)
+    if not overridden:
+        client.__enter__()
+        atexit.register(client.__exit__, None, None, None)
     
     def call_query(request_data: Dict[str, Any]) -> tuple[Dict[str, Any], int]:
         """Call /query endpoint in-process."""
         try:
             response = client.post("/query", json=request_data)
-            return response.json(), response.status_code
+            return parse_response_body(response), response.status_code
         except Exception as e:
             return {}, 500
     
@@ -441,9 +596,22 @@ def create_inprocess_client(db_mode: str = "real", db_url: Optional[str] = None)
         """Get database session for numeric correctness checks."""
         return db_session_factory()
     
+    _CLIENT_CACHE[cache_key] = (
+        call_query, get_db_session, data_mode, db_session_factory if overridden else None
+    )
+    
     return call_query, get_db_session, data_mode
 
 
+def write_report(report_path: Path, report: Dict[str, Any]) -> None:
+    """Write the evaluation report as indented JSON, using orjson when it is installed."""
+    if ORJSON_AVAILABLE:
+        report_path.write_bytes(orjson.dumps(report, option=orjson.OPT_INDENT_2, default=str))
+    else:
+        with open(report_path, 'w') as f:
+            json.dump(report, f, indent=2, default=str)
+
+
 def run_evaluation(
     base_url: Optional[str] = None,
     inprocess: bool = True,
@@ -486,114 +654,125 @@ def run_evaluation(
             base_url = "http://127.0.0.1:8000"
         print(f"Running against remote server: {base_url}")
         print("Database mode: REAL (using server's database)")
-        call_query = create_remote_client(base_url)
+        call_queries = create_remote_client(base_url)
         # For remote mode, we can't easily get DB session, so skip numeric checks
         db_session_factory = None
     
     print(f"Loading questions from {questions_path}...")
     questions = load_questions(questions_path)
     
-    print(f"Running {len(questions)} test cases...\n")
+    # Call /query endpoint (both clients turn request errors into an empty 500 response)
+    if inprocess:
+        # One at a time, each request sent as soon as its line is parsed
+        print("Running test cases...\n")
+        cases = (
+            (question_data, call_query(build_query_request(question_data)))
+            for question_data in questions
+        )
+    else:
+        # All at once against a remote server, which needs every request up front
+        questions = list(questions)
+        print(f"Running {len(questions)} test cases...\n")
+        cases = zip(questions, call_queries([build_query_request(q) for q in questions]))
     
     results = []
     
-    for question_data in questions:
-        qid = question_data["id"]
-        question = question_data["question"]
-        month = question_data.get("month")
-        expect = question_data["expect"]
-        
-        # Call /query endpoint
-        request_data = {
-            "question": question,
-            "limit_evidence": 10
-        }
-        if month:
-            request_data["month"] = month
-        
-        try:
-            response_data, status_code = call_query(request_data)
-        except Exception as e:
-            response_data = {}
-            status_code = 500
-            error = str(e)
-        
-        # Run checks
-        checks = {}
-        
-        # Check 1: trace_present
-        passed, message = check_trace_present(response_data)
-        checks["trace_present"] = {"passed": passed, "message": message}
-        
-        # Check 2: evidence_rule
-        passed, message = check_evidence_rule(response_data)
-        checks["evidence_rule"] = {"passed": passed, "message": message}
-        
-        # Check 3: intent_match
-        passed, message = check_intent_match(response_data, expect.get("type"))
-        checks["intent_match"] = {"passed": passed, "message": message}
-        
-        # Check 4: numeric_correctness (only in in-process mode)
-        if db_session_factory:
-            passed, message = check_numeric_correctness(response_data, expect, db_session_factory)
-            checks["numeric_correctness"] = {"passed": passed, "message": message}
-        else:
-            checks["numeric_correctness"] = {"passed": True, "message": "skipped (remote mode)"}
-        
-        # Overall pass/fail
-        all_passed = all(check["passed"] for check in checks.values())
-        
-        result = {
-            "id": qid,
-            "question": question,
-            "month": month,
-            "expect": expect,
-            "status_code": status_code,
-            "response": response_data,
-            "checks": checks,
-            "passed": all_passed
-        }
-        
-        results.append(result)
-        
-        # Print status
-        status = "✓" if all_passed else "✗"
-        print(f"{status} {qid}: {question[:50]}...")
-        if not all_passed:
-            for check_name, check_result in checks.items():
-                if not check_result["passed"]:
-                    print(f"    {check_name}: {check_result['message']}")
-    
-    # Summary
+    # One session for every numeric check, rather than one per question
+    db = db_session_factory() if db_session_factory else None
+    expected_metric = memoize_expected_metrics(db) if db is not None else None
+    try:
+        for question_data, (response_data, status_code) in cases:
+            qid = question_data["id"]
+            question = question_data["question"]
+            month = question_data.get("month")
+            expect = question_data["expect"]
+            
+            # Run checks
+            checks = {}
+            
+            # Check 1: trace_present
+            passed, message = check_trace_present(response_data)
+            checks["trace_present"] = {"passed": passed, "message": message}
+            
+            # Check 2: evidence_rule
+            passed, message = check_evidence_rule(response_data)
+            checks["evidence_rule"] = {"passed": passed, "message": message}
+            
+            # Check 3: intent_match
+            passed, message = check_intent_match(response_data, expect.get("type"))
+            checks["intent_match"] = {"passed": passed, "message": message}
+            
+            # Check 4: numeric_correctness (only in in-process mode)
+            if db is not None:
+                passed, message = check_numeric_correctness(response_data, expect, db, expected_metric)
+                checks["numeric_correctness"] = {"passed": passed, "message": message}
+            else:
+                checks["numeric_correctness"] = {"passed": True, "message": "skipped (remote mode)"}
+            
+            # Overall pass/fail
+            all_passed = all(check["passed"] for check in checks.values())
+            
+            result = {
+                "id": qid,
+                "question": question,
+                "month": month,
+                "expect": expect,
+                "status_code": status_code,
+                "response": response_data,
+                "checks": checks,
+                "passed": all_passed
+            }
+            
+            results.append(result)
+            
+            # Print status
+            status = "✓" if all_passed else "✗"
+            print(f"{status} {qid}: {question[:50]}...")
+            if not all_passed:
+                for check_name, check_result in checks.items():
+                    if not check_result["passed"]:
+                        print(f"    {check_name}: {check_result['message']}")
+    finally:
+        if db is not None:
+            db.close()
+    
+    # Summary: tally everything in one pass over the results
     total = len(results)
-    passed = sum(1 for r in results if r["passed"])
+    passed = 0
+    check_passed: Dict[str, int] = defaultdict(int)
+    numeric_applicable_count = 0
+    numeric_passed = 0
+    clarify_count = 0
+    clarify_passed = 0
+    for r in results:
+        checks = r["checks"]
+        passed += r["passed"]
+        for check_name, check_result in checks.items():
+            check_passed[check_name] += check_result["passed"]
+        
+        expect_type = r["expect"].get("type")
+        if expect_type in NUMERIC_TYPES:
+            numeric_applicable_count += 1
+            numeric_passed += checks.get("numeric_correctness", {}).get("passed", False)
+        elif expect_type in CLARIFY_TYPES:
+            # Check if clarifying_question is present when expected
+            clarify_count += 1
+            clarify_passed += r["response"].get("clarifying_question") is not None
     failed = total - passed
     
     # Calculate specific rates
     # Trace compliance rate
-    trace_passed = sum(1 for r in results if r["checks"].get("trace_present", {}).get("passed", False))
+    trace_passed = check_passed["trace_present"]
     trace_compliance_rate = (trace_passed / total * 100) if total > 0 else 0.0
     
     # Evidence compliance rate
-    evidence_passed = sum(1 for r in results if r["checks"].get("evidence_rule", {}).get("passed", False))
+    evidence_passed = check_passed["evidence_rule"]
     evidence_compliance_rate = (evidence_passed / total * 100) if total > 0 else 0.0
     
     # Numeric accuracy rate (only for applicable cases)
-    numeric_applicable_types = ["category_total", "merchant_total", "source_total", "monthly_summary"]
-    numeric_applicable = [r for r in results if r["expect"].get("type") in numeric_applicable_types]
-    numeric_applicable_count = len(numeric_applicable)
-    numeric_passed = sum(1 for r in numeric_applicable if r["checks"].get("numeric_correctness", {}).get("passed", False))
     numeric_accuracy_rate = (numeric_passed / numeric_applicable_count * 100) if numeric_applicable_count > 0 else None
     
     # Clarification correctness rate (only for clarify cases)
-    # Check if clarifying_question is present when expected
-    clarify_types = ["clarify_month", "clarify_entity"]
-    clarify_cases = [r for r in results if r["expect"].get("type") in clarify_types]
-    clarify_count = len(clarify_cases)
-    clarify_passed = sum(
-        1 for r in clarify_cases 
-        if r["response"].get("clarifying_question") is not None
-    )
     clarification_correctness_rate = (clarify_passed / clarify_count * 100) if clarify_count > 0 else None
     
     print("\n" + "=" * 80)
@@ -620,8 +799,7 @@ def run_evaluation(
     print("\nCheck Breakdown:")
     check_names = ["trace_present", "evidence_rule", "intent_match", "numeric_correctness"]
     for check_name in check_names:
-        check_passed = sum(1 for r in results if r["checks"].get(check_name, {}).get("passed", False))
-        print(f"  {check_name}: {check_passed}/{total} ({check_passed/total*100:.1f}%)")
+        print(f"  {check_name}: {check_passed[check_name]}/{total} ({check_passed[check_name]/total*100:.1f}%)")
     
     # Write report
     report = {
@@ -644,15 +822,15 @@ def run_evaluation(
         "results": results
     }
     
-    with open(report_path, 'w') as f:
-        json.dump(report, f, indent=2, default=str)
+    write_report(report_path, report)
     
     print(f"\nDetailed report written to {report_path}")
     
     # Cleanup
     if inprocess and (db_mode == "seeded" or (db_mode == "real" and db_url)):
-        # Clear overrides if we set them (seeded mode or real mode with custom db_url)
-        app.dependency_overrides.clear()
+        # Clear overrides if we set them (seeded mode or real mode with custom db_url);
+        # a cached client reinstalls its override on the next create_inprocess_client
+        restore_db_dependencies()
     
     return report
 
@@ -1,29 +1,51 @@
+import asyncio
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
 from app.core.config import get_settings
-from app.core.db import Base, engine
+from app.core.db import engine, read_engine
+from app.core.migrations import init_database
+from app.api.responses import DefaultJSONResponse
 from app.api.routes import ingest, summary, query
 
 settings = get_settings()
 
-app = FastAPI(title=settings.app_name)
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Create or upgrade the database schema on startup and close pooled connections on shutdown."""
+    # init_database inspects every table before creating or altering it, so keep
+    # that blocking I/O off the event loop
+    await asyncio.to_thread(init_database, engine)
+    try:
+        yield
+    finally:
+        # Release pooled connections so reloads and test runs don't leak them
+        read_engine.dispose()
+        engine.dispose()
+
+
+app = FastAPI(
+    title=settings.app_name,
+    default_response_class=DefaultJSONResponse,
+    lifespan=lifespan
+)
 
 app.add_middleware(
     CORSMiddleware,
     allow_origins=["http://localhost:3000", "http://127.0.0.1:3000"],
     allow_credentials=True,
-    allow_methods=["*"],
+    # Every route is a GET or a POST
+    allow_methods=["GET", "POST"],
     allow_headers=["*"],
+    # Let browsers cache preflight responses for a day instead of re-sending
+    # OPTIONS before each request
+    max_age=86400,
 )
 
 
-@app.on_event("startup")
-async def startup_event():
-    """Create database tables on startup."""
-    Base.metadata.create_all(bind=engine)
-
-
 @app.get("/health")
 async def health():
     """Health check endpoint."""
@@ -1,5 +1,40 @@
+import re
 from datetime import datetime, date
 
+# English abbreviations accepted by the fast path in parse_date
+_WEEKDAY_ABBRS = frozenset(("Mon", "Tue", "Wed", "Thu", "Fri", "Sat", "Sun"))
+_MONTH_ABBRS = {
+    "Jan": 1, "Feb": 2, "Mar": 3, "Apr": 4, "May": 5, "Jun": 6,
+    "Jul": 7, "Aug": 8, "Sep": 9, "Oct": 10, "Nov": 11, "Dec": 12,
+}
+
+
+def _parse_canonical_date(value: str):
+    """
+    Parse "Sat, 24 Jun 2025" exactly as written (two-digit day, title-case names).
+    
+    Slices the fixed positions instead of running strptime. Returns None for any
+    other spelling, or for a date that doesn't exist, so the caller can fall back
+    to strptime (which accepts the looser forms and produces the error message).
+    """
+    if (
+        len(value) != 16
+        or not value.isascii()
+        or value[3:5] != ", "
+        or value[7] != " "
+        or value[11] != " "
+        or value[:3] not in _WEEKDAY_ABBRS
+    ):
+        return None
+    month = _MONTH_ABBRS.get(value[8:11])
+    day, year = value[5:7], value[12:16]
+    if month is None or not day.isdigit() or not year.isdigit():
+        return None
+    try:
+        return date(int(year), month, int(day))
+    except ValueError:
+        return None
+
 
 def parse_date(value: str) -> date:
     """
@@ -23,6 +58,11 @@ def parse_date(value: str) -> date:
     if not value:
         raise ValueError("Empty date string cannot be parsed")
     
+    # Fast path for the form the CSV exports use
+    parsed = _parse_canonical_date(value)
+    if parsed is not None:
+        return parsed
+    
     try:
         # Parse using the expected format: "%a, %d %b %Y"
         # Example: "Sat, 24 Jun 2025"
@@ -33,3 +73,52 @@ def parse_date(value: str) -> date:
             f"Failed to parse date '{value}'. Expected format: 'Day, DD Mon YYYY' "
             f"(e.g., 'Sat, 24 Jun 2025'). Original error: {str(e)}"
         ) from e
+
+
+# "YYYY-MM"; the month number is range-checked against VALID_MONTH_NUMBERS
+MONTH_RE = re.compile(r"^\d{4}-(?P<month>\d{2})$")
+VALID_MONTH_NUMBERS = frozenset(f"{n:02d}" for n in range(1, 13))
+
+
+def month_key(year: int, month: int) -> int:
+    """
+    Return the integer key for a calendar month (year * 12 + month).
+    
+    Keys sort in the same order as "YYYY-MM" strings, so the transactions table
+    can filter and index months by integer instead of by string.
+    
+    Args:
+        year: Four-digit year
+        month: Month number, 1-12
+        
+    Returns:
+        Integer month key
+    """
+    return year * 12 + month
+
+
+def year_month_key(year_month: str) -> int:
+    """
+    Return the month key for a "YYYY-MM" string (the string is not validated).
+    
+    Args:
+        year_month: Month in "YYYY-MM" format
+        
+    Returns:
+        Integer month key, as computed by month_key
+    """
+    return month_key(int(year_month[:4]), int(year_month[5:7]))
+
+
+def year_month_from_key(key: int) -> str:
+    """
+    Return the "YYYY-MM" string for a month key (inverse of month_key).
+    
+    Args:
+        key: Integer month key (year * 12 + month)
+        
+    Returns:
+        Month in "YYYY-MM" format
+    """
+    year, month_index = divmod(key - 1, 12)
+    return f"{year:04d}-{month_index + 1:02d}"
@@ -1,5 +1,8 @@
 from decimal import Decimal, InvalidOperation
 
+# Amounts are stored to the cent
+CENT = Decimal("0.01")
+
 
 def parse_amount(value: str) -> Decimal:
     """
@@ -40,7 +43,7 @@ def parse_amount(value: str) -> Decimal:
         # Parse to Decimal (preserves sign as provided)
         amount = Decimal(cleaned)
         # Quantize to 2 decimal places
-        return amount.quantize(Decimal("0.01"))
+        return amount.quantize(CENT)
     except InvalidOperation as e:
         raise ValueError(
             f"Failed to parse amount '{value}'. Expected a numeric value "
@@ -0,0 +1,121 @@
+from typing import Callable, Dict, List
+
+import pytest
+from sqlalchemy import create_engine, create_mock_engine, event
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+from sqlalchemy.pool import StaticPool
+
+from app.core.db import Base
+import app.core.models  # noqa: F401  (registers the tables with Base)
+
+# Rendered CREATE TABLE / CREATE INDEX statements per dialect name, in the order
+# create_all emits them
+_DDL_CACHE: Dict[str, List[str]] = {}
+
+
+def _schema_ddl(engine: Engine) -> List[str]:
+    """Render the schema's DDL for engine's dialect once, then serve it from _DDL_CACHE."""
+    dialect_name = engine.dialect.name
+    statements = _DDL_CACHE.get(dialect_name)
+    if statements is None:
+        statements = []
+
+        def record(sql, *multiparams, **params):
+            statements.append(str(sql.compile(dialect=mock_engine.dialect)).strip())
+
+        mock_engine = create_mock_engine(engine.url, record)
+        Base.metadata.create_all(mock_engine, checkfirst=False)
+        _DDL_CACHE[dialect_name] = statements
+    return statements
+
+
+@pytest.fixture(scope="session")
+def create_schema() -> Callable[[Engine], None]:
+    """
+    Create every table on a fresh, empty database.
+
+    Equivalent to Base.metadata.create_all(bind=engine), but the DDL is compiled
+    once per test session and replayed on later engines, skipping the per-table
+    existence checks and the SQL compiler.
+    """
+    def create(engine: Engine) -> None:
+        with engine.begin() as connection:
+            for statement in _schema_ddl(engine):
+                connection.exec_driver_sql(statement)
+
+    return create
+
+
+# Test-only SQLite settings: no fsync, in-memory rollback journal and temp
+# tables, and no file locking between statements
+TEST_SQLITE_PRAGMAS = """
+PRAGMA synchronous=OFF;
+PRAGMA journal_mode=MEMORY;
+PRAGMA locking_mode=EXCLUSIVE;
+PRAGMA temp_store=MEMORY;
+"""
+
+
+@pytest.fixture(scope="session")
+def db_engine(create_schema):
+    """Create one in-memory SQLite database, with the schema, for the whole test session."""
+    engine = create_engine(
+        "sqlite://",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool
+    )
+
+    # pysqlite defers BEGIN until the first write, which would let a SAVEPOINT open
+    # (and its RELEASE commit) a transaction of its own; emit BEGIN explicitly instead.
+    # The database never outlives the test run, so skip durability work as well
+    @event.listens_for(engine, "connect")
+    def configure_connection(dbapi_connection, connection_record):
+        dbapi_connection.isolation_level = None
+        dbapi_connection.executescript(TEST_SQLITE_PRAGMAS)
+
+    @event.listens_for(engine, "begin")
+    def emit_begin(connection):
+        connection.exec_driver_sql("BEGIN")
+
+    create_schema(engine)
+    try:
+        yield engine
+    finally:
+        Base.metadata.drop_all(bind=engine)
+        engine.dispose()
+
+
+@pytest.fixture
+def db_session(db_engine):
+    """
+    Session whose writes are rolled back after each test.
+
+    The session joins an outer transaction on a dedicated connection and turns
+    its own commits into savepoint releases, so tests can commit freely while
+    the schema is created only once.
+    """
+    connection = db_engine.connect()
+    transaction = connection.begin()
+    session = Session(
+        bind=connection,
+        autoflush=False,
+        join_transaction_mode="create_savepoint"
+    )
+    try:
+        yield session
+    finally:
+        session.close()
+        transaction.rollback()
+        connection.close()
+
+
+@pytest.fixture(scope="session")
+def client():
+    """One TestClient for the whole session; tests install their own database overrides."""
+    from fastapi.testclient import TestClient
+    from app.main import app
+
+    # Not entered as a context manager: that would run the app's lifespan, which
+    # creates tables in the configured (file) database rather than the test one
+    return TestClient(app)
@@ -0,0 +1,57 @@
+from app.core.cache import TTLCache, invalidate_caches
+
+
+class TestTTLCache:
+    """Tests for TTLCache and invalidate_caches."""
+
+    def test_hit_skips_compute(self):
+        """Test that a cached key is not recomputed."""
+        cache = TTLCache(maxsize=8, ttl_seconds=60)
+        calls = []
+
+        def compute():
+            calls.append(1)
+            return ["Cash"]
+
+        assert cache.get_or_compute("2025-05", compute) == ["Cash"]
+        assert cache.get_or_compute("2025-05", compute) == ["Cash"]
+        assert len(calls) == 1
+
+    def test_invalidate_caches_clears_entries(self):
+        """Test that invalidate_caches forces the next lookup to recompute."""
+        cache = TTLCache(maxsize=8, ttl_seconds=60)
+        cache.get_or_compute("2025-05", lambda: "old")
+
+        invalidate_caches()
+
+        assert cache.get_or_compute("2025-05", lambda: "new") == "new"
+
+    def test_value_computed_across_invalidation_is_not_stored(self):
+        """Test that a result computed while caches are invalidated is not cached."""
+        cache = TTLCache(maxsize=8, ttl_seconds=60)
+
+        def compute_during_ingest():
+            # An ingest commits and invalidates while this read is in flight
+            invalidate_caches()
+            return "pre-ingest"
+
+        assert cache.get_or_compute("2025-05", compute_during_ingest) == "pre-ingest"
+        assert cache.get_or_compute("2025-05", lambda: "post-ingest") == "post-ingest"
+
+    def test_expired_entry_is_recomputed(self):
+        """Test that entries older than the TTL are recomputed."""
+        cache = TTLCache(maxsize=8, ttl_seconds=0)
+        cache.get_or_compute("2025-05", lambda: "old")
+
+        assert cache.get_or_compute("2025-05", lambda: "new") == "new"
+
+    def test_maxsize_evicts_least_recently_used(self):
+        """Test that the least recently used key is evicted past maxsize."""
+        cache = TTLCache(maxsize=2, ttl_seconds=60)
+        cache.get_or_compute("a", lambda: 1)
+        cache.get_or_compute("b", lambda: 2)
+        cache.get_or_compute("a", lambda: 1)
+        cache.get_or_compute("c", lambda: 3)
+
+        assert cache.get_or_compute("a", lambda: "recomputed") == 1
+        assert cache.get_or_compute("b", lambda: "recomputed") == "recomputed"
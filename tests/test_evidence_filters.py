@@ -1,29 +1,12 @@
-import pytest
 from datetime import date
 from decimal import Decimal
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker, Session
+from sqlalchemy.orm import Session
 import uuid
 
-from app.core.db import Base
 from app.core.models import Transaction, Ingest
 from app.core.evidence import get_evidence_rows
 
 
-@pytest.fixture
-def db_session():
-    """Create an in-memory SQLite database session for testing."""
-    engine = create_engine("sqlite:///:memory:", connect_args={"check_same_thread": False})
-    Base.metadata.create_all(bind=engine)
-    SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
-    session = SessionLocal()
-    try:
-        yield session
-    finally:
-        session.close()
-        Base.metadata.drop_all(bind=engine)
-
-
 class TestEvidenceFilters:
     """Tests for get_evidence_rows filtering."""
     
@@ -49,7 +32,6 @@ class TestEvidenceFilters:
                 date=date(2025, 5, 10),
                 year_month="2025-05",
                 amount=Decimal("25.50"),
-                abs_amount=Decimal("25.50"),
                 where_="Grocery Store",
                 what_="Groceries",
                 category="Food",
@@ -61,7 +43,6 @@ class TestEvidenceFilters:
                 date=date(2025, 5, 15),
                 year_month="2025-05",
                 amount=Decimal("12.00"),
-                abs_amount=Decimal("12.00"),
                 where_="Restaurant",
                 what_="Lunch",
                 category="Food",
@@ -73,7 +54,6 @@ class TestEvidenceFilters:
                 date=date(2025, 5, 20),
                 year_month="2025-05",
                 amount=Decimal("150.00"),
-                abs_amount=Decimal("150.00"),
                 where_="Airline",
                 what_="Flight",
                 category="Travel",
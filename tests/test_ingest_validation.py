@@ -19,14 +19,9 @@ class TestValidateColumns:
             # Missing "Category"
         })
         
-        with pytest.raises(ValueError) as exc_info:
+        # The error message lists the missing column
+        with pytest.raises(ValueError, match=r"Missing required columns: \['Category'\]"):
             validate_columns(df)
-        
-        # Verify the error message lists the missing column
-        error_message = str(exc_info.value)
-        assert "Missing required columns" in error_message
-        assert "Category" in error_message
-        assert "['Category']" in error_message or '"Category"' in error_message
     
     def test_all_columns_present(self):
         """Test that validate_columns passes when all required columns are present."""
@@ -51,10 +46,6 @@ class TestValidateColumns:
             # Missing "Where?", "What?", "Category", "Source"
         })
         
-        with pytest.raises(ValueError) as exc_info:
+        # Multiple missing columns are listed
+        with pytest.raises(ValueError, match=r"Missing required columns.*(?:Where\?|What\?)"):
             validate_columns(df)
-        
-        error_message = str(exc_info.value)
-        assert "Missing required columns" in error_message
-        # Verify multiple missing columns are listed
-        assert "Where?" in error_message or "What?" in error_message
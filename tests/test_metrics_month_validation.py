@@ -1,27 +1,11 @@
 import pytest
 from decimal import Decimal
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker, Session
+from sqlalchemy.orm import Session
 
-from app.core.db import Base
 from app.core.models import Transaction, Ingest  # Import models to register with Base
 from app.core.metrics import get_monthly_totals
 
 
-@pytest.fixture
-def db_session():
-    """Create an in-memory SQLite database session for testing."""
-    engine = create_engine("sqlite:///:memory:", connect_args={"check_same_thread": False})
-    Base.metadata.create_all(bind=engine)
-    SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
-    session = SessionLocal()
-    try:
-        yield session
-    finally:
-        session.close()
-        Base.metadata.drop_all(bind=engine)
-
-
 class TestMetricsMonthValidation:
     """Tests for month validation in metrics functions."""
     
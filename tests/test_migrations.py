@@ -0,0 +1,129 @@
+from datetime import date
+from decimal import Decimal
+
+from sqlalchemy import create_engine, inspect, text
+from sqlalchemy.pool import StaticPool
+
+from app.core.migrations import init_database
+from app.core.models import Transaction
+
+# The transactions table as created before month_key existed, including the
+# abs_amount and raw_row columns that were dropped later
+OLD_TRANSACTIONS_DDL = (
+    """
+    CREATE TABLE ingest (
+        ingest_id VARCHAR(36) NOT NULL PRIMARY KEY,
+        created_at DATETIME NOT NULL,
+        filename VARCHAR(255) NOT NULL,
+        row_count INTEGER NOT NULL,
+        status VARCHAR(50) NOT NULL,
+        error TEXT
+    )
+    """,
+    """
+    CREATE TABLE transactions (
+        id VARCHAR(36) NOT NULL PRIMARY KEY,
+        ingest_id VARCHAR(36) NOT NULL REFERENCES ingest (ingest_id),
+        date DATE NOT NULL,
+        year_month VARCHAR(7) NOT NULL,
+        amount NUMERIC(10, 2) NOT NULL,
+        abs_amount NUMERIC(10, 2) NOT NULL,
+        where_ VARCHAR(255),
+        what_ VARCHAR(255),
+        category VARCHAR(100),
+        source VARCHAR(100),
+        raw_row TEXT
+    )
+    """,
+    "CREATE INDEX ix_transactions_year_month ON transactions (year_month)",
+    "CREATE INDEX idx_category_year_month ON transactions (category, year_month)",
+    "INSERT INTO ingest VALUES ('ingest-1', '2025-06-01 00:00:00', 'old.csv', 2, 'success', NULL)",
+    "INSERT INTO transactions VALUES "
+    "('txn-1', 'ingest-1', '2025-05-10', '2025-05', 25.50, 25.50, 'Store', 'Food', 'Food', 'Cash', '{}'), "
+    "('txn-2', 'ingest-1', '2024-12-31', '2024-12', -10.00, 10.00, 'Employer', 'Pay', NULL, 'Chase', NULL)",
+)
+
+
+def _old_database():
+    """In-memory database holding the pre-month_key schema and two rows."""
+    engine = create_engine(
+        "sqlite://",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool
+    )
+    with engine.begin() as connection:
+        for statement in OLD_TRANSACTIONS_DDL:
+            connection.execute(text(statement))
+    return engine
+
+
+def _index_names(engine) -> set:
+    with engine.connect() as connection:
+        return set(connection.execute(text(
+            "SELECT name FROM sqlite_master WHERE type = 'index' "
+            "AND tbl_name = 'transactions' AND sql IS NOT NULL"
+        )).scalars())
+
+
+class TestInitDatabase:
+    """Tests for upgrading an existing database in init_database."""
+
+    def test_adds_and_backfills_month_key(self):
+        """Test that month_key is added to an old table and filled from year_month."""
+        engine = _old_database()
+        init_database(engine)
+
+        with engine.connect() as connection:
+            rows = connection.execute(text("SELECT id, month_key FROM transactions ORDER BY id")).all()
+        assert rows == [("txn-1", 2025 * 12 + 5), ("txn-2", 2024 * 12 + 12)]
+
+    def test_indexes_match_model(self):
+        """Test that the model's indexes are created and the old year_month ones dropped."""
+        engine = _old_database()
+        init_database(engine)
+
+        assert _index_names(engine) == {index.name for index in Transaction.__table__.indexes}
+
+    def test_drops_removed_columns_and_keeps_rows(self):
+        """Test that abs_amount and raw_row are dropped, rows kept, and raw rows moved."""
+        engine = _old_database()
+        init_database(engine)
+
+        columns = [column["name"] for column in inspect(engine).get_columns("transactions")]
+        assert columns == [column.name for column in Transaction.__table__.columns]
+        with engine.begin() as connection:
+            assert connection.execute(text("SELECT count(*) FROM transactions")).scalar() == 2
+            raw_rows = connection.execute(text("SELECT transaction_id, raw_row FROM transaction_raw")).all()
+            assert raw_rows == [("txn-1", "{}")]
+
+            # An insert without abs_amount, as ingest does, now succeeds
+            connection.execute(Transaction.__table__.insert(), [{
+                "id": "txn-3",
+                "ingest_id": "ingest-1",
+                "date": date(2025, 6, 1),
+                "year_month": "2025-06",
+                "amount": Decimal("1.00"),
+            }])
+
+    def test_is_idempotent(self):
+        """Test that running init_database again on an upgraded or new database is a no-op."""
+        engine = _old_database()
+        init_database(engine)
+        init_database(engine)
+        assert "month_key" in {c["name"] for c in inspect(engine).get_columns("transactions")}
+
+        fresh = create_engine("sqlite://", poolclass=StaticPool)
+        init_database(fresh)
+        init_database(fresh)
+        assert _index_names(fresh) == {index.name for index in Transaction.__table__.indexes}
+
+    def test_keeps_unrelated_indexes(self):
+        """Test that an index created by hand survives a restart."""
+        engine = _old_database()
+        init_database(engine)
+        with engine.begin() as connection:
+            connection.execute(text("CREATE INDEX my_what_idx ON transactions (what_)"))
+
+        init_database(engine)
+
+        assert "my_what_idx" in _index_names(engine)
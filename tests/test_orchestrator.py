@@ -6,30 +6,31 @@ from app.llm.orchestrator import classify_intent, extract_month
 class TestClassifyIntent:
     """Tests for classify_intent function."""
     
-    def test_monthly_summary_intent(self):
-        """Test that 'How much did I spend in 2025-05?' is classified as monthly_summary."""
-        question = "How much did I spend in 2025-05?"
-        result = classify_intent(question)
-        assert result == "monthly_summary"
+    @pytest.mark.parametrize("question, intent", [
+        pytest.param("How much did I spend in 2025-05?", "monthly_summary", id="monthly_summary"),
+        pytest.param("Give category breakdown for 2025-05", "category_breakdown", id="category_breakdown"),
+    ])
+    def test_classify_intent(self, question, intent):
+        """Test that each question is classified as the expected intent."""
+        assert classify_intent(question) == intent
     
-    def test_category_breakdown_intent(self):
-        """Test that 'Give category breakdown for 2025-05' is classified as category_breakdown."""
-        question = "Give category breakdown for 2025-05"
-        result = classify_intent(question)
-        assert result == "category_breakdown"
+    def test_repeated_question_is_served_from_cache(self):
+        """Test that a repeated question with the same known sources is a cache hit."""
+        classify_intent.cache_clear()
+        question = "How much did I spend using Cash in 2025-05?"
+        first = classify_intent(question, ["Cash", "Credit Card"])
+        second = classify_intent(question, ["Cash", "Credit Card"])
+        assert first == second == "source_total"
+        assert classify_intent.cache_info().hits == 1
 
 
 class TestExtractMonth:
     """Tests for extract_month function."""
     
-    def test_extract_month_finds_valid_month(self):
-        """Test that extract_month finds '2025-05' in a question."""
-        question = "How much did I spend in 2025-05?"
-        result = extract_month(question)
-        assert result == "2025-05"
-    
-    def test_extract_month_returns_none_when_no_month(self):
-        """Test that extract_month returns None when no month is found."""
-        question = "How much did I spend?"
-        result = extract_month(question)
-        assert result is None
+    @pytest.mark.parametrize("question, month", [
+        pytest.param("How much did I spend in 2025-05?", "2025-05", id="finds_valid_month"),
+        pytest.param("How much did I spend?", None, id="none_when_no_month"),
+    ])
+    def test_extract_month(self, question, month):
+        """Test that extract_month returns the question's month, or None without one."""
+        assert extract_month(question) == month
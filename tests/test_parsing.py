@@ -1,115 +1,150 @@
+import json
+import uuid
 import pytest
 from datetime import date
 from decimal import Decimal
 
+import pandas as pd
+
 from app.utils.dates import parse_date
 from app.utils.money import parse_amount
+from app.core.parsing import normalize_transactions, raw_transaction_rows
+from app.core.models import Transaction
 
 
 class TestParseDate:
     """Tests for parse_date function."""
     
-    def test_valid_date(self):
-        """Test parsing a valid date string."""
-        result = parse_date("Sat, 24 May 2025")
-        assert result == date(2025, 5, 24)
-    
-    def test_valid_date_with_whitespace(self):
-        """Test parsing a date string with leading/trailing whitespace."""
-        result = parse_date("  Sat, 24 May 2025  ")
-        assert result == date(2025, 5, 24)
-    
-    def test_invalid_format(self):
-        """Test that invalid date format raises ValueError."""
-        with pytest.raises(ValueError, match="Failed to parse date"):
-            parse_date("2025-05-24")
-    
-    def test_invalid_date_string(self):
-        """Test that invalid date string raises ValueError."""
-        with pytest.raises(ValueError, match="Failed to parse date"):
-            parse_date("Invalid date")
-    
-    def test_empty_string(self):
-        """Test that empty string raises ValueError."""
-        with pytest.raises(ValueError, match="Empty date string"):
-            parse_date("")
-    
-    def test_whitespace_only(self):
-        """Test that whitespace-only string raises ValueError."""
-        with pytest.raises(ValueError, match="Empty date string"):
-            parse_date("   ")
-    
-    def test_non_string_input(self):
-        """Test that non-string input raises ValueError."""
-        with pytest.raises(ValueError, match="Expected string"):
-            parse_date(123)
-        
-        with pytest.raises(ValueError, match="Expected string"):
-            parse_date(None)
+    @pytest.mark.parametrize("value, expected", [
+        pytest.param("Sat, 24 May 2025", date(2025, 5, 24), id="valid_date"),
+        pytest.param("  Sat, 24 May 2025  ", date(2025, 5, 24), id="valid_date_with_whitespace"),
+        # Forms outside the fast path (case, one-digit day) still parse
+        pytest.param("sat, 24 may 2025", date(2025, 5, 24), id="lowercase"),
+        pytest.param("Sun, 1 Jun 2025", date(2025, 6, 1), id="one_digit_day"),
+    ])
+    def test_valid(self, value, expected):
+        """Test parsing valid date strings."""
+        assert parse_date(value) == expected
+    
+    @pytest.mark.parametrize("value, error_match", [
+        pytest.param("Sat, 30 Feb 2025", "Failed to parse date", id="nonexistent_date"),
+        pytest.param("2025-05-24", "Failed to parse date", id="invalid_format"),
+        pytest.param("Invalid date", "Failed to parse date", id="invalid_date_string"),
+        pytest.param("", "Empty date string", id="empty_string"),
+        pytest.param("   ", "Empty date string", id="whitespace_only"),
+        pytest.param(123, "Expected string", id="int_input"),
+        pytest.param(None, "Expected string", id="none_input"),
+    ])
+    def test_invalid(self, value, error_match):
+        """Test that invalid input raises ValueError with a matching message."""
+        with pytest.raises(ValueError, match=error_match):
+            parse_date(value)
 
 
 class TestParseAmount:
     """Tests for parse_amount function."""
     
-    def test_positive_with_dollar_sign(self):
-        """Test parsing positive amount with dollar sign."""
-        result = parse_amount("$6.15")
-        assert result == Decimal("6.15")
-    
-    def test_negative_with_dollar_sign(self):
-        """Test parsing negative amount with dollar sign."""
-        result = parse_amount("-$10.00")
-        assert result == Decimal("-10.00")
-    
-    def test_positive_without_dollar_sign(self):
-        """Test parsing positive amount without dollar sign."""
-        result = parse_amount("6.15")
-        assert result == Decimal("6.15")
-    
-    def test_negative_without_dollar_sign(self):
-        """Test parsing negative amount without dollar sign."""
-        result = parse_amount("-10.00")
-        assert result == Decimal("-10.00")
-    
-    def test_with_commas(self):
-        """Test parsing amount with comma separators."""
-        result = parse_amount("$1,234.56")
-        assert result == Decimal("1234.56")
-    
-    def test_with_whitespace(self):
-        """Test parsing amount with leading/trailing whitespace."""
-        result = parse_amount("  $6.15  ")
-        assert result == Decimal("6.15")
-    
-    def test_quantization(self):
-        """Test that amounts are quantized to 2 decimal places."""
-        result = parse_amount("$6.1")
-        assert result == Decimal("6.10")
-    
-    def test_invalid_string(self):
-        """Test that invalid amount string raises ValueError."""
-        with pytest.raises(ValueError, match="Failed to parse amount"):
-            parse_amount("not a number")
-    
-    def test_empty_string(self):
-        """Test that empty string raises ValueError."""
-        with pytest.raises(ValueError, match="Empty amount string"):
-            parse_amount("")
-    
-    def test_whitespace_only(self):
-        """Test that whitespace-only string raises ValueError."""
-        with pytest.raises(ValueError, match="Empty amount string"):
-            parse_amount("   ")
-    
-    def test_only_symbols(self):
-        """Test that string with only symbols raises ValueError."""
-        with pytest.raises(ValueError, match="contains no numeric value"):
-            parse_amount("$$$")
-    
-    def test_non_string_input(self):
-        """Test that non-string input raises ValueError."""
-        with pytest.raises(ValueError, match="Expected string"):
-            parse_amount(123)
+    @pytest.mark.parametrize("value, expected", [
+        pytest.param("$6.15", Decimal("6.15"), id="positive_with_dollar_sign"),
+        pytest.param("-$10.00", Decimal("-10.00"), id="negative_with_dollar_sign"),
+        pytest.param("6.15", Decimal("6.15"), id="positive_without_dollar_sign"),
+        pytest.param("-10.00", Decimal("-10.00"), id="negative_without_dollar_sign"),
+        pytest.param("$1,234.56", Decimal("1234.56"), id="with_commas"),
+        pytest.param("  $6.15  ", Decimal("6.15"), id="with_whitespace"),
+        pytest.param("$6.1", Decimal("6.10"), id="quantization"),
+    ])
+    def test_valid(self, value, expected):
+        """Test parsing valid amount strings."""
+        assert parse_amount(value) == expected
+    
+    @pytest.mark.parametrize("value, error_match", [
+        pytest.param("not a number", "Failed to parse amount", id="invalid_string"),
+        pytest.param("", "Empty amount string", id="empty_string"),
+        pytest.param("   ", "Empty amount string", id="whitespace_only"),
+        pytest.param("$$$", "contains no numeric value", id="only_symbols"),
+        pytest.param(123, "Expected string", id="int_input"),
+        pytest.param(None, "Expected string", id="none_input"),
+    ])
+    def test_invalid(self, value, error_match):
+        """Test that invalid input raises ValueError with a matching message."""
+        with pytest.raises(ValueError, match=error_match):
+            parse_amount(value)
+
+
+class TestNormalizeTransactions:
+    """Tests for normalize_transactions function."""
+    
+    def test_keys_match_table_columns(self):
+        """Test that rows can be passed straight to a Core insert on the transactions table."""
+        df = pd.DataFrame({
+            "Date": ["Sat, 24 May 2025"],
+            "Amount": ["$6.15"],
+            "Where?": ["Cafe"],
+            "What?": ["Coffee"],
+            "Category": ["Food"],
+            "Source": ["Cash"],
+        })
+        rows = normalize_transactions(df, "ingest-1")
+        
+        assert set(rows[0]) == set(Transaction.__table__.columns.keys())
+    
+    def test_month_key_matches_year_month(self):
+        """Test that month_key is year * 12 + month for each row's year_month."""
+        df = pd.DataFrame({
+            "Date": ["Wed, 31 Dec 2025", "Thu, 01 Jan 2026"],
+            "Amount": ["$6.15", "$1.00"],
+            "Where?": ["Cafe", "Cafe"],
+            "What?": ["Coffee", "Coffee"],
+            "Category": ["Food", "Food"],
+            "Source": ["Cash", "Cash"],
+        })
+        rows = normalize_transactions(df, "ingest-1")
+        
+        assert [(row["year_month"], row["month_key"]) for row in rows] == [
+            ("2025-12", 2025 * 12 + 12),
+            ("2026-01", 2026 * 12 + 1),
+        ]
+    
+    def test_ids_are_unique_uuid4_strings(self):
+        """Test that every row gets its own version 4 UUID string."""
+        df = pd.DataFrame({
+            "Date": ["Sat, 24 May 2025"] * 50,
+            "Amount": ["$6.15"] * 50,
+            "Where?": ["Cafe"] * 50,
+            "What?": ["Coffee"] * 50,
+            "Category": ["Food"] * 50,
+            "Source": ["Cash"] * 50,
+        })
+        rows = normalize_transactions(df, "ingest-1")
+        
+        ids = [row["id"] for row in rows]
+        assert len(set(ids)) == 50
+        for transaction_id in ids:
+            parsed = uuid.UUID(transaction_id)
+            assert str(parsed) == transaction_id
+            assert parsed.version == 4
+            assert parsed.variant == uuid.RFC_4122
+    
+    def test_raw_rows_keep_original_values(self):
+        """Test that raw rows map each transaction id to its original CSV row."""
+        df = pd.DataFrame({
+            "Date": ["Sat, 24 May 2025", "Sun, 25 May 2025"],
+            "Amount": ["$6.15", "$1,200.00"],
+            "Where?": ["Cafe", None],
+            "What?": ["Coffee", "Rent"],
+            "Category": ["Food", "Home"],
+            "Source": ["Cash", "Chase"],
+        })
+        rows = normalize_transactions(df, "ingest-1")
+        raw_rows = raw_transaction_rows(df, rows)
         
-        with pytest.raises(ValueError, match="Expected string"):
-            parse_amount(None)
+        assert [raw["transaction_id"] for raw in raw_rows] == [row["id"] for row in rows]
+        assert all(raw["ingest_id"] == "ingest-1" for raw in raw_rows)
+        assert json.loads(raw_rows[1]["raw_row"]) == {
+            "Date": "Sun, 25 May 2025",
+            "Amount": "$1,200.00",
+            "Where?": None,
+            "What?": "Rent",
+            "Category": "Home",
+            "Source": "Chase",
+        }
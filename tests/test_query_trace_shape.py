@@ -1,80 +1,88 @@
 import pytest
 from datetime import date
 from decimal import Decimal
-from fastapi.testclient import TestClient
-from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker
-from sqlalchemy.pool import StaticPool
-import uuid
 
-from app.main import app
-from app.core.db import Base, get_db
+from app.core.db import get_db, get_read_db
+from app.core.cache import invalidate_caches
 from app.core.models import Transaction, Ingest
+from app.api.schemas import QueryResponse
+
+
+# Keys every /query trace must contain
+REQUIRED_TRACE_KEYS = frozenset({
+    "intent",
+    "resolved_month",
+    "called_functions",
+    "parameters",
+    "filters_used",
+    "evidence_count_returned",
+    "notes"
+})
 
 
 @pytest.fixture
-def test_db():
-    """Create an in-memory SQLite database for testing."""
-    engine = create_engine(
-        "sqlite://",
-        connect_args={"check_same_thread": False},
-        poolclass=StaticPool
-    )
-    Base.metadata.create_all(bind=engine)
-    SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+def test_db(db_engine):
+    """Seed one Food transaction and route the app's sessions to it, rolled back after the test."""
+    # Imported here so collecting this module doesn't load the whole app
+    from app.main import app
     
-    # Seed database with one Food transaction in 2025-05
-    session = SessionLocal()
+    # Everything below runs inside one outer transaction; sessions commit to
+    # savepoints, and the rollback on teardown discards the seeded rows
+    connection = db_engine.connect()
+    transaction = connection.begin()
     
-    # Create an ingest record
-    ingest_id = str(uuid.uuid4())
-    ingest = Ingest(
-        ingest_id=ingest_id,
-        filename="test.csv",
-        row_count=1,
-        status="success",
-        error=None
+    SessionLocal = sessionmaker(
+        bind=connection,
+        autoflush=False,
+        join_transaction_mode="create_savepoint"
     )
-    session.add(ingest)
-    session.flush()
     
-    # Create one Food transaction in 2025-05
-    transaction = Transaction(
-        id=str(uuid.uuid4()),
-        ingest_id=ingest_id,
-        date=date(2025, 5, 10),
-        year_month="2025-05",
-        amount=Decimal("25.50"),
-        abs_amount=Decimal("25.50"),
-        where_="Grocery Store",
-        what_="Groceries",
-        category="Food",
-        source="Credit Card"
-    )
-    session.add(transaction)
-    session.commit()
-    session.close()
+    # Seed database with one Food transaction in 2025-05 through Core inserts (no
+    # unit-of-work bookkeeping); column defaults still fill created_at and month_key
+    with SessionLocal.begin() as session:
+        session.execute(Ingest.__table__.insert(), [{
+            "ingest_id": "ingest-1",
+            "filename": "test.csv",
+            "row_count": 1,
+            "status": "success",
+            "error": None
+        }])
+        session.execute(Transaction.__table__.insert(), [{
+            "id": "txn-1",
+            "ingest_id": "ingest-1",
+            "date": date(2025, 5, 10),
+            "year_month": "2025-05",
+            "amount": Decimal("25.50"),
+            "where_": "Grocery Store",
+            "what_": "Groceries",
+            "category": "Food",
+            "source": "Credit Card"
+        }])
+    
+    # Override get_db and get_read_db dependencies. Every request runs on the same
+    # connection anyway, so they share one session, closed on teardown
+    shared_session = SessionLocal()
     
-    # Override get_db dependency
     def override_get_db():
-        db = SessionLocal()
-        try:
-            yield db
-        finally:
-            db.close()
+        yield shared_session
     
     app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[get_read_db] = override_get_db
+    invalidate_caches()
     
-    yield
-    
-    # Cleanup - clear dependency overrides after test
-    app.dependency_overrides.clear()
+    try:
+        yield
+    finally:
+        # Cleanup - clear dependency overrides and discard the seeded rows
+        app.dependency_overrides.clear()
+        shared_session.close()
+        transaction.rollback()
+        connection.close()
 
 
-def test_query_trace_shape(test_db):
+def test_query_trace_shape(client, test_db):
     """Test that /query response trace contains all required keys."""
-    client = TestClient(app)
-    
     # Call /query with a category question
     response = client.post(
         "/query",
@@ -92,18 +100,8 @@ def test_query_trace_shape(test_db):
     assert "trace" in data
     trace = data["trace"]
     
-    required_keys = [
-        "intent",
-        "resolved_month",
-        "called_functions",
-        "parameters",
-        "filters_used",
-        "evidence_count_returned",
-        "notes"
-    ]
-    
-    for key in required_keys:
-        assert key in trace, f"Trace missing required key: {key}"
+    missing_keys = REQUIRED_TRACE_KEYS - trace.keys()
+    assert not missing_keys, f"Trace missing required keys: {sorted(missing_keys)}"
     
     # Assert trace values are appropriate
     assert trace["intent"] is not None
@@ -113,3 +111,30 @@ def test_query_trace_shape(test_db):
     assert isinstance(trace["filters_used"], dict)
     assert isinstance(trace["evidence_count_returned"], int)
     assert isinstance(trace["notes"], list)
+
+
+def test_query_response_matches_schema(client, test_db):
+    """Test that the directly serialized /query payload still matches QueryResponse."""
+    response = client.post(
+        "/query",
+        json={
+            "question": "How much did I spend on Food in 2025-05?",
+            "month": "2025-05",
+            "limit_evidence": 10
+        }
+    )
+    
+    assert response.status_code == 200
+    data = response.json()
+    
+    parsed = QueryResponse.model_validate(data)
+    assert parsed.model_dump(mode="json") == data
+    assert data["evidence"] == [{
+        "transaction_id": "txn-1",
+        "date": "2025-05-10",
+        "where": "Grocery Store",
+        "what": "Groceries",
+        "amount": "25.50",
+        "category": "Food",
+        "source": "Credit Card"
+    }]
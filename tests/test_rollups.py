@@ -0,0 +1,175 @@
+import pytest
+from datetime import date
+from decimal import Decimal
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker, Session
+import uuid
+
+from app.core.db import Base
+from app.core.models import Transaction, Ingest, MonthlySummary
+from app.core.metrics import (
+    get_monthly_totals,
+    get_category_breakdown,
+    get_top_merchants,
+    get_source_breakdown,
+    get_month_aggregates,
+    get_category_total,
+    get_merchant_total,
+    get_source_total
+)
+from app.core.rollups import refresh_monthly_rollups, has_monthly_rollup
+
+
+@pytest.fixture
+def rollup_session(create_schema):
+    """Create an in-memory SQLite database session for testing."""
+    engine = create_engine("sqlite:///:memory:", connect_args={"check_same_thread": False})
+    create_schema(engine)
+    SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    session = SessionLocal()
+    try:
+        yield session
+    finally:
+        session.close()
+        Base.metadata.drop_all(bind=engine)
+
+
+def _seed(rollup_session: Session) -> None:
+    """Insert a small mix of expenses, income, and NULL fields across two months."""
+    ingest_id = str(uuid.uuid4())
+    rollup_session.add(Ingest(
+        ingest_id=ingest_id,
+        filename="test.csv",
+        row_count=6,
+        status="success",
+        error=None
+    ))
+    rollup_session.flush()
+
+    rows = [
+        ("2025-05", date(2025, 5, 3), "45.50", "Grocery Store", "Food", "Chase"),
+        ("2025-05", date(2025, 5, 9), "12.25", "Grocery Store", "Food", "Cash"),
+        ("2025-05", date(2025, 5, 12), "300.00", "Airline", "Travel", "Chase"),
+        ("2025-05", date(2025, 5, 20), "-500.00", "Employer", None, "Chase"),
+        ("2025-05", date(2025, 5, 22), "8.10", None, None, None),
+        ("2025-06", date(2025, 6, 1), "19.99", "Target", "Essentials", "BofA"),
+    ]
+    for year_month, txn_date, amount, where, category, source in rows:
+        rollup_session.add(Transaction(
+            id=str(uuid.uuid4()),
+            ingest_id=ingest_id,
+            date=txn_date,
+            year_month=year_month,
+            amount=Decimal(amount),
+            where_=where,
+            what_="Test",
+            category=category,
+            source=source
+        ))
+    rollup_session.commit()
+
+
+def _summary(rollup_session: Session, month: str):
+    return (
+        get_monthly_totals(rollup_session, month),
+        get_category_breakdown(rollup_session, month),
+        get_top_merchants(rollup_session, month, k=5),
+        get_source_breakdown(rollup_session, month),
+    )
+
+
+class TestMonthlyRollups:
+    """Tests for the ingest-time monthly rollup tables."""
+
+    def test_rollups_match_live_aggregates(self, rollup_session: Session):
+        """Test that rollup-backed metrics equal the live GROUP BY results."""
+        _seed(rollup_session)
+        live = _summary(rollup_session, "2025-05")
+
+        refresh_monthly_rollups(rollup_session, ["2025-05"])
+        rollup_session.commit()
+
+        assert has_monthly_rollup(rollup_session, "2025-05")
+        assert _summary(rollup_session, "2025-05") == live
+
+    def test_refresh_only_touches_given_months(self, rollup_session: Session):
+        """Test that months not refreshed keep using the live queries."""
+        _seed(rollup_session)
+
+        refresh_monthly_rollups(rollup_session, ["2025-05"])
+        rollup_session.commit()
+
+        assert not has_monthly_rollup(rollup_session, "2025-06")
+        assert get_monthly_totals(rollup_session, "2025-06")["expense_total"] == Decimal("19.99")
+
+    def test_refresh_is_idempotent(self, rollup_session: Session):
+        """Test that refreshing a month twice leaves a single set of rollup rows."""
+        _seed(rollup_session)
+
+        refresh_monthly_rollups(rollup_session, ["2025-05", "2025-06"])
+        refresh_monthly_rollups(rollup_session, ["2025-05"])
+        rollup_session.commit()
+
+        assert rollup_session.query(MonthlySummary).count() == 2
+        assert get_monthly_totals(rollup_session, "2025-05")["transaction_count"] == 5
+
+    def test_month_aggregates_match_individual_queries(self, rollup_session: Session):
+        """Test that the single-scan aggregates equal the per-metric results, live and rolled up."""
+        _seed(rollup_session)
+
+        for refresh in (False, True):
+            if refresh:
+                refresh_monthly_rollups(rollup_session, ["2025-05"])
+                rollup_session.commit()
+            totals, by_category, _, by_source = _summary(rollup_session, "2025-05")
+
+            assert get_month_aggregates(rollup_session, "2025-05") == {
+                "totals": totals,
+                "by_category": by_category,
+                "by_source": by_source
+            }
+
+    def test_top_merchants_limit_skips_null_merchants(self, rollup_session: Session):
+        """Test that a large NULL-merchant expense doesn't take one of the top k slots."""
+        _seed(rollup_session)
+        ingest_id = rollup_session.query(Ingest.ingest_id).scalar()
+        rollup_session.add(Transaction(
+            id=str(uuid.uuid4()),
+            ingest_id=ingest_id,
+            date=date(2025, 5, 25),
+            year_month="2025-05",
+            amount=Decimal("1000.00"),
+            where_=None,
+            what_="Test",
+            category="Others",
+            source="Cash"
+        ))
+        rollup_session.commit()
+
+        for refresh in (False, True):
+            if refresh:
+                refresh_monthly_rollups(rollup_session, ["2025-05"])
+                rollup_session.commit()
+            merchants = get_top_merchants(rollup_session, "2025-05", k=2)
+
+            assert [m["where"] for m in merchants] == ["Airline", "Grocery Store"]
+            assert [str(m["expense_total"]) for m in merchants] == ["300.00", "57.75"]
+
+    def test_entity_totals_match_live_aggregates(self, rollup_session: Session):
+        """Test that per-entity totals read from rollups equal the live queries."""
+        _seed(rollup_session)
+        lookups = [
+            (get_category_total, "Food"),
+            (get_category_total, "Missing"),
+            (get_merchant_total, "grocery store"),
+            (get_merchant_total, "Missing"),
+            (get_source_total, "Chase"),
+            (get_source_total, "Missing"),
+        ]
+        live = [fn(rollup_session, "2025-05", value) for fn, value in lookups]
+
+        refresh_monthly_rollups(rollup_session, ["2025-05"])
+        rollup_session.commit()
+
+        assert [fn(rollup_session, "2025-05", value) for fn, value in lookups] == live
+        assert live[2] == {"expense_total": Decimal("57.75"), "count": 2}
@@ -0,0 +1,128 @@
+import pytest
+from datetime import date
+from decimal import Decimal
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+import uuid
+
+from app.main import app
+from app.core.db import get_db, get_read_db
+from app.core.cache import invalidate_caches
+from app.core.models import Transaction, Ingest
+
+
+def _seed(SessionLocal) -> None:
+    """Insert a few May 2025 transactions across categories, sources, and merchants."""
+    session = SessionLocal()
+    ingest_id = str(uuid.uuid4())
+    session.add(Ingest(
+        ingest_id=ingest_id,
+        filename="test.csv",
+        row_count=4,
+        status="success",
+        error=None
+    ))
+    session.flush()
+
+    rows = [
+        (date(2025, 5, 3), "45.50", "Grocery Store", "Food", "Chase"),
+        (date(2025, 5, 9), "12.25", "Grocery Store", "Food", "Cash"),
+        (date(2025, 5, 12), "300.00", "Airline", "Travel", "Chase"),
+        (date(2025, 5, 20), "-500.00", "Employer", None, "Chase"),
+    ]
+    for txn_date, amount, where, category, source in rows:
+        session.add(Transaction(
+            id=str(uuid.uuid4()),
+            ingest_id=ingest_id,
+            date=txn_date,
+            year_month="2025-05",
+            amount=Decimal(amount),
+            where_=where,
+            what_="Test",
+            category=category,
+            source=source
+        ))
+    session.commit()
+    session.close()
+
+
+@pytest.fixture(params=["file", "memory"])
+def summary_client(request, tmp_path, create_schema):
+    """TestClient over a file-backed (pooled) or in-memory (StaticPool) SQLite database."""
+    if request.param == "file":
+        engine = create_engine(
+            f"sqlite:///{tmp_path / 'summary.db'}",
+            connect_args={"check_same_thread": False}
+        )
+    else:
+        engine = create_engine(
+            "sqlite://",
+            connect_args={"check_same_thread": False},
+            poolclass=StaticPool
+        )
+    create_schema(engine)
+    SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    _seed(SessionLocal)
+
+    def override_get_db():
+        db = SessionLocal()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[get_read_db] = override_get_db
+    invalidate_caches()
+
+    yield TestClient(app)
+
+    app.dependency_overrides.clear()
+    engine.dispose()
+
+
+class TestMonthlySummaryEndpoint:
+    """Tests for GET /summary/monthly."""
+
+    def test_summary_aggregates(self, summary_client):
+        """Test that totals, breakdowns, and top merchants are all returned."""
+        response = summary_client.get("/summary/monthly", params={"month": "2025-05", "top_k": 1})
+
+        assert response.status_code == 200
+        data = response.json()
+        assert data["month"] == "2025-05"
+        assert Decimal(str(data["totals"]["expense_total"])) == Decimal("357.75")
+        assert Decimal(str(data["totals"]["income_total"])) == Decimal("-500.00")
+        assert data["totals"]["transaction_count"] == 4
+        assert [row["category"] for row in data["by_category"]] == ["Travel", "Food"]
+        assert [row["where"] for row in data["top_merchants"]] == ["Airline"]
+        assert [row["source"] for row in data["by_source"]] == ["Chase", "Cash"]
+
+    def test_invalid_month_returns_400(self, summary_client):
+        """Test that a bad month is reported as a 400 error."""
+        response = summary_client.get("/summary/monthly", params={"month": "2025-13"})
+
+        assert response.status_code == 400
+
+    def test_ingest_refreshes_cached_summary(self, summary_client):
+        """Test that a cached summary is recomputed after an ingest."""
+        first = summary_client.get("/summary/monthly", params={"month": "2025-05"})
+        assert first.json()["totals"]["transaction_count"] == 4
+
+        csv_data = (
+            "Date,Amount,Where?,What?,Category,Source\n"
+            '"Sat, 24 May 2025",$6.15,Cafe,Coffee,Food,Cash\n'
+        )
+        ingest = summary_client.post(
+            "/ingest",
+            params={"replace": True},
+            files={"file": ("test.csv", csv_data.encode(), "text/csv")}
+        )
+        assert ingest.status_code == 200
+
+        second = summary_client.get("/summary/monthly", params={"month": "2025-05"})
+        totals = second.json()["totals"]
+        assert totals["transaction_count"] == 1
+        assert Decimal(str(totals["expense_total"])) == Decimal("6.15")